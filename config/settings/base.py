@@ -299,8 +299,20 @@ LOGGING = {
 # ------------------------------------------------------------------------------
 # https://github.com/django-es/django-elasticsearch-dsl
 ELASTICSEARCH_DSL = {"default": {"hosts": f"{env('ELASTICSEARCH_HOST')}"}}
+# queues the objects changed in a transaction and indexes them in bulk on commit
+ELASTICSEARCH_DSL_SIGNAL_PROCESSOR = (
+    "radical_translations.utils.indexing.TransactionSignalProcessor"
+)
+ELASTICSEARCH_DSL_ON_COMMIT = env.bool("ELASTICSEARCH_DSL_ON_COMMIT", True)
+# indexes the queued objects in a background thread instead of in the request
+ELASTICSEARCH_DSL_BACKGROUND = env.bool("ELASTICSEARCH_DSL_BACKGROUND", False)
+# changes to related objects affecting more objects than this are indexed in batches
+# by the process_index_queue command
+ELASTICSEARCH_DSL_FAN_OUT_LIMIT = env.int("ELASTICSEARCH_DSL_FAN_OUT_LIMIT", 100)
 
 ES_FACET_OPTIONS = {"order": {"_key": "asc"}, "size": 1000}
+# seconds the search facets are cached for, they are also discarded on index writes
+ES_FACET_CACHE_TIMEOUT = env.int("ES_FACET_CACHE_TIMEOUT", 60 * 60)
 ES_FUZZINESS_OPTIONS = {"fuzziness": "1"}
 
 # Wagtail
@@ -377,6 +389,21 @@ SEARCH_OPTIONS = {
         "year_min": 1516,
         "year_max": 1900,
         "map_field": "places",
+        # the map loads the results aggregated in cells from the geo endpoint
+        "map_geo": 1,
+        # fields of the results used by the search page
+        "fields": [
+            "id",
+            "title",
+            "highlight",
+            "is_private",
+            "is_original",
+            "is_translation",
+            "date_display",
+            "places",
+            "authors",
+            "contributions",
+        ],
         "ordering": [
             {"key": "score", "value": "Relevance"},
             {"key": "title", "value": "Title ascending"},
@@ -393,6 +420,7 @@ SEARCH_OPTIONS = {
         "year_min": 1780,
         "year_max": 1820,
         "resources": 1,
+        "fields": ["id", "title", "date", "classification", "country", "year"],
     },
     "agents": {
         "label": "Agents",
@@ -402,6 +430,22 @@ SEARCH_OPTIONS = {
         "year_min": 1450,
         "year_max": 1900,
         "map_field": "based_near",
+        "fields": [
+            "id",
+            "name",
+            "name_index",
+            "is_private",
+            "agent_type",
+            "gender",
+            "noble",
+            "date_display",
+            "place_birth",
+            "place_death",
+            "languages",
+            "based_near",
+            "main_places",
+            "roles",
+        ],
         "filters": [["anonymous", "no"]],
         "ordering": [
             {"key": "score", "value": "Relevance"},
@@ -47,5 +47,11 @@ TEMPLATES[-1]["OPTIONS"]["loaders"] = [  # type: ignore[index] # noqa F405
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-backend
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 
+# ELASTICSEARCH
+# ------------------------------------------------------------------------------
+# the tests run inside transactions that are never committed, index the changes as
+# soon as they are made
+ELASTICSEARCH_DSL_ON_COMMIT = False
+
 # Your stuff...
 # ------------------------------------------------------------------------------
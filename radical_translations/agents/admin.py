@@ -26,6 +26,9 @@ class AgentAdmin(PolymorphicParentModelAdmin):
     ]
     search_fields = ["name", "roles__label", "based_near__address"]
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_is_private()
+
 
 class AgentInline(admin.TabularInline):
     model = Agent.based_near.through
@@ -53,6 +56,9 @@ class AgentChildAdmin(PolymorphicChildModelAdmin):
     search_fields = ["name", "roles__label", "based_near__address"]
     show_in_index = True
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_is_private()
+
 
 @admin.register(Organisation)
 class OrganisationAdmin(AgentChildAdmin):
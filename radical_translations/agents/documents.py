@@ -1,4 +1,5 @@
-from django_elasticsearch_dsl import Document, fields
+from django.db.models import Q
+from django_elasticsearch_dsl import fields
 from django_elasticsearch_dsl.registries import registry
 
 from controlled_vocabulary.models import ControlledTerm
@@ -6,8 +7,10 @@ from geonames_place.models import Place
 from radical_translations.agents.models import Agent
 from radical_translations.core.models import Contribution
 from radical_translations.utils.documents import (
+    HashedDocument,
     get_agent_field,
     get_controlled_term_field,
+    get_country_name,
     get_place_field,
     get_resource_field,
 )
@@ -17,7 +20,7 @@ copy_to_content = {"copy_to": "content"}
 
 
 @registry.register_document
-class AgentDocument(Document):
+class AgentDocument(HashedDocument):
     meta = fields.KeywordField()
     content = fields.TextField(attr="name", store=True)
 
@@ -83,9 +86,28 @@ class AgentDocument(Document):
         if isinstance(related_instance, (ControlledTerm, Place)):
             return related_instance.agents.all()
 
+    def get_modified_queryset(self, since):
+        """Returns the agents to index that were modified after `since`, either
+        themselves or the rows their documents are prepared from."""
+        return self.get_queryset().filter(
+            Q(modified__gt=since)
+            | Q(person__date_birth__modified__gt=since)
+            | Q(person__date_death__modified__gt=since)
+            | Q(
+                pk__in=Contribution.objects.filter(
+                    Q(modified__gt=since)
+                    | Q(resource__modified__gt=since)
+                    | Q(resource__title__modified__gt=since)
+                ).values("agent")
+            )
+        )
+
     def prepare_meta(self, instance):
         return [instance.agent_type]
 
+    def prepare_is_private(self, instance):
+        return instance._is_private
+
     def prepare_name_sort(self, instance):
         name = instance.get_index_name().lower()
 
@@ -118,7 +140,9 @@ class AgentDocument(Document):
         return {
             "address": place.address,
             "geo": place.geo,
-            "coutry": {"name": place.country.name} if place.country else {},
+            "coutry": {"name": get_country_name(place.country_id)}
+            if place.country_id
+            else {},
         }
 
     def prepare_year(self, instance):
@@ -126,16 +150,10 @@ class AgentDocument(Document):
             return
 
         date_birth = instance.date_birth
-        year_birth = None
-
-        if date_birth and date_birth.get_date_earliest():
-            year_birth = date_birth.get_date_earliest().year
+        year_birth = date_birth.year_earliest if date_birth else None
 
         date_death = instance.date_death
-        year_death = None
-
-        if date_death and date_death.get_date_latest():
-            year_death = date_death.get_date_latest().year
+        year_death = date_death.year_latest if date_death else None
 
         if year_birth and year_death:
             return [year for year in range(year_birth, year_death + 1)]
@@ -19,7 +19,7 @@ class Command(BaseCommand):
             f"Exporting {title.title()} into CSV files {title}.csv ...",
             ending=" ",
         )
-        agents = [agent.to_dict() for agent in cls.objects.all()]
+        agents = [agent.to_dict() for agent in cls.objects.with_is_private()]
 
         if not agents:
             self.stderr.write(self.style.NOTICE(f"No {title} found!"))
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-18 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0017_alter_field_main_places_on_person'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='agent',
+            name='_is_private',
+            field=models.BooleanField(db_index=True, default=True, editable=False),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 2.2.28 on 2026-10-18 12:07
+
+from django.db import migrations
+
+
+def load_agent_is_private(apps, _):
+    Agent = apps.get_model("agents", "Agent")
+    Contribution = apps.get_model("core", "Contribution")
+    Organisation = apps.get_model("agents", "Organisation")
+
+    public_ids = set(
+        Contribution.objects.filter(resource__is_private=False).values_list(
+            "agent_id", flat=True
+        )
+    ) | set(
+        Organisation.members.through.objects.values_list("organisation_id", flat=True)
+    )
+
+    Agent.objects.filter(id__in=public_ids).update(_is_private=False)
+    Agent.objects.exclude(id__in=public_ids).update(_is_private=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agents", "0018_agent_is_private"),
+        ("core", "0067_load_radical_markers"),
+    ]
+
+    operations = [
+        migrations.RunPython(load_agent_is_private, migrations.RunPython.noop)
+    ]
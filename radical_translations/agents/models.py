@@ -2,8 +2,11 @@ from typing import Dict, Optional
 
 from django.conf import settings
 from django.db import models
+from django.db.models import Exists, OuterRef
 from model_utils.models import TimeStampedModel
+from polymorphic.managers import PolymorphicManager
 from polymorphic.models import PolymorphicModel
+from polymorphic.query import PolymorphicQuerySet
 
 from controlled_vocabulary.models import ControlledTermsField
 from controlled_vocabulary.utils import search_term_or_none
@@ -24,9 +27,33 @@ csv_multi_sep = settings.EXPORT_MULTIVALUE_SEPARATOR
 # http://xmlns.com/foaf/spec/#term_Agent
 
 
+class AgentQuerySet(PolymorphicQuerySet):
+    def with_is_private(self) -> "AgentQuerySet":
+        """Annotates whether the agents have public contributions and members, which
+        `is_private` uses instead of querying the database for each agent."""
+        from radical_translations.core.models import Contribution
+
+        return self.annotate(
+            has_public_contributions=Exists(
+                Contribution.objects.filter(
+                    agent=OuterRef("pk"), resource__is_private=False
+                )
+            ),
+            has_members=Exists(
+                Organisation.members.through.objects.filter(
+                    organisation=OuterRef("pk")
+                )
+            ),
+        )
+
+
 class Agent(PolymorphicModel, TimeStampedModel):
     """Entity having a role in a resource, such as a person or organization."""
 
+    # agents without public contributions, and organisations without members, are
+    # private; kept in sync by the signals in `radical_translations.core.signals`
+    _is_private = models.BooleanField(default=True, editable=False, db_index=True)
+
     name = models.CharField(max_length=512, help_text="The agent name.")
     radical = models.BooleanField(
         default=False,
@@ -69,6 +96,8 @@ class Agent(PolymorphicModel, TimeStampedModel):
         ),
     )
 
+    objects = PolymorphicManager.from_queryset(AgentQuerySet)()
+
     class Meta:
         ordering = ["name"]
 
@@ -89,7 +118,38 @@ class Agent(PolymorphicModel, TimeStampedModel):
 
     @property
     def is_private(self) -> bool:
-        return self.contributed_to.exclude(resource__is_private=True).count() == 0
+        # uses the `with_is_private` annotation when available
+        has_public_contributions = getattr(self, "has_public_contributions", None)
+        if has_public_contributions is None:
+            has_public_contributions = self.contributed_to.exclude(
+                resource__is_private=True
+            ).exists()
+
+        return not has_public_contributions
+
+    @staticmethod
+    def refresh_all_is_private(queryset: Optional[models.QuerySet] = None) -> int:
+        """Recomputes and stores the private flag for all the agents in the
+        `queryset`. Returns the number of agents updated."""
+        if queryset is None:
+            queryset = Agent.objects.all()
+
+        queryset = queryset.non_polymorphic()
+
+        private_ids = list(
+            queryset.with_is_private()
+            .filter(has_public_contributions=False, has_members=False)
+            .values_list("id", flat=True)
+        )
+
+        return (
+            queryset.filter(id__in=private_ids, _is_private=False).update(
+                _is_private=True
+            )
+            + queryset.exclude(id__in=private_ids)
+            .filter(_is_private=True)
+            .update(_is_private=False)
+        )
 
     @property
     def title(self) -> str:
@@ -111,6 +171,7 @@ class Agent(PolymorphicModel, TimeStampedModel):
     def to_dict(self) -> str:
         return {
             "id": self.id,
+            "is_private": self.is_private,
             "name": self.name,
             "based_near": f"{csv_multi_sep} ".join(
                 [place_to_dict_value(p) for p in self.based_near.all()]
@@ -352,7 +413,12 @@ class Organisation(Agent):
 
     @property
     def is_private(self) -> bool:
-        return super().is_private and self.members.count() == 0
+        # uses the `with_is_private` annotation when available
+        has_members = getattr(self, "has_members", None)
+        if has_members is None:
+            has_members = self.members.exists()
+
+        return super().is_private and not has_members
 
     def to_dict(self) -> Dict:
         return {
@@ -1,8 +1,9 @@
 from django_elasticsearch_dsl_drf.serializers import DocumentSerializer
 
 from radical_translations.agents.documents import AgentDocument
+from radical_translations.utils.serializers import SourceFieldsSerializerMixin
 
 
-class AgentDocumentSerializer(DocumentSerializer):
+class AgentDocumentSerializer(SourceFieldsSerializerMixin, DocumentSerializer):
     class Meta:
         document = AgentDocument
@@ -2,7 +2,9 @@ from collections import defaultdict
 
 import pytest
 
-from radical_translations.agents.models import Organisation, Person
+from radical_translations.agents.models import Agent, Organisation, Person
+from radical_translations.core.models import Contribution
+from radical_translations.core.tests.factories import ResourceFactory
 
 pytestmark = pytest.mark.django_db
 
@@ -36,6 +38,19 @@ class TestOrganisation:
 
         assert Organisation.objects.count() == 1
 
+    @pytest.mark.usefixtures("person", "organisation")
+    def test_is_private(self, person: Person, organisation: Organisation):
+        assert organisation.is_private
+        assert Agent.objects.non_polymorphic().get(pk=organisation.pk)._is_private
+
+        organisation.members.add(person)
+        assert not organisation.is_private
+        assert not Agent.objects.non_polymorphic().get(pk=organisation.pk)._is_private
+
+        organisation = Organisation.objects.with_is_private().get(pk=organisation.pk)
+        assert organisation.has_members
+        assert not organisation.is_private
+
 
 @pytest.mark.usefixtures("vocabulary")
 class TestPerson:
@@ -89,3 +104,24 @@ class TestPerson:
         assert p is not None
 
         assert Person.objects.count() == 3
+
+    @pytest.mark.usefixtures("person")
+    def test_is_private(self, person: Person):
+        assert person.is_private
+
+        resource = ResourceFactory(is_private=True)
+        Contribution.get_or_create(resource, person, "author")
+        assert person.is_private
+        assert Agent.objects.non_polymorphic().get(pk=person.pk)._is_private
+
+        resource.is_private = False
+        resource.save()
+        assert not person.is_private
+        assert not Agent.objects.non_polymorphic().get(pk=person.pk)._is_private
+
+        person = Person.objects.with_is_private().get(pk=person.pk)
+        assert person.has_public_contributions
+        assert not person.is_private
+
+        Agent.objects.update(_is_private=True)
+        assert Agent.refresh_all_is_private() == 1
@@ -0,0 +1,61 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from radical_translations.agents.models import Agent, Organisation, Person
+from radical_translations.agents.tests.factories import (
+    OrganisationFactory,
+    PersonFactory,
+)
+from radical_translations.core.models import Contribution
+from radical_translations.core.tests.factories import ResourceFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.usefixtures("vocabulary")
+class TestAgentDetailView:
+    def add_relations(self, person: Person, organisation: Organisation, count: int):
+        for _ in range(count):
+            resource = ResourceFactory()
+            Contribution.get_or_create(resource, person, "author")
+            Contribution.get_or_create(resource, organisation, "publisher")
+            resource.held_by.add(organisation)
+
+            known = PersonFactory()
+            person.knows.add(known)
+            organisation.members.add(known)
+            OrganisationFactory().members.add(person)
+
+    def get_queries(self, client, agent: Agent) -> CaptureQueriesContext:
+        url = reverse("agent-detail", kwargs={"pk": agent.pk})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+            assert response.status_code == 200
+
+        return queries
+
+    @pytest.mark.usefixtures("person", "organisation")
+    def test_get_object(self, client, person: Person, organisation: Organisation):
+        self.add_relations(person, organisation, 1)
+
+        for agent in [person, organisation]:
+            self.get_queries(client, agent)
+            queries = self.get_queries(client, agent)
+
+            self.add_relations(person, organisation, 5)
+
+            assert len(self.get_queries(client, agent)) == len(queries)
+
+    @pytest.mark.usefixtures("person")
+    def test_is_private(self, client, person: Person):
+        url = reverse("agent-detail", kwargs={"pk": person.pk})
+
+        resource = ResourceFactory(is_private=True)
+        Contribution.get_or_create(resource, person, "author")
+        assert client.get(url).status_code == 403
+
+        Contribution.get_or_create(ResourceFactory(), person, "author")
+        assert client.get(url).status_code == 200
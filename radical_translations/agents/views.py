@@ -1,7 +1,8 @@
 import igraph as ig
 import plotly.graph_objects as go
 from django.conf import settings
-from django.shortcuts import render
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404, render
 from django_elasticsearch_dsl_drf.constants import (
     SUGGESTER_COMPLETION,
     SUGGESTER_PHRASE,
@@ -10,7 +11,6 @@ from django_elasticsearch_dsl_drf.constants import (
 from django_elasticsearch_dsl_drf.filter_backends import (
     CompoundSearchFilterBackend,
     DefaultOrderingFilterBackend,
-    FacetedSearchFilterBackend,
     FilteringFilterBackend,
     OrderingFilterBackend,
     SuggesterFilterBackend,
@@ -20,8 +20,13 @@ from plotly.offline import plot
 from radical_translations.agents.documents import AgentDocument
 from radical_translations.agents.models import Agent, Organisation, Person
 from radical_translations.agents.serializers import AgentDocumentSerializer
+from radical_translations.core.models import Contribution, Resource
 from radical_translations.core.views import BaseDetailView, BaseDocumentViewSet
-from radical_translations.utils.search import PageNumberPagination
+from radical_translations.utils.search import (
+    CachedFacetedSearchFilterBackend,
+    PageNumberPagination,
+    SourceFieldsFilterBackend,
+)
 
 ES_FACET_OPTIONS = settings.ES_FACET_OPTIONS
 ES_FUZZINESS_OPTIONS = settings.ES_FUZZINESS_OPTIONS
@@ -30,6 +35,56 @@ ES_FUZZINESS_OPTIONS = settings.ES_FUZZINESS_OPTIONS
 class AgentDetailView(BaseDetailView):
     model = Agent
 
+    def get_object(self, queryset=None):
+        # resolves the agent subclass once, to load the agent directly from the
+        # subclass with the relations its template uses
+        agent = get_object_or_404(
+            Agent.objects.non_polymorphic().only("id", "polymorphic_ctype"),
+            pk=self.kwargs.get(self.pk_url_kwarg),
+        )
+
+        return super().get_object(
+            self.get_agent_queryset(agent.get_real_instance_class())
+        )
+
+    def get_agent_queryset(self, model):
+        queryset = (
+            model.objects.non_polymorphic()
+            .with_is_private()
+            .prefetch_related(
+                "based_near",
+                "page__vocabulary",
+                "roles",
+                Prefetch(
+                    "contributed_to",
+                    queryset=Contribution.objects.select_related(
+                        "resource__title"
+                    ).prefetch_related("classification", "roles"),
+                ),
+            )
+        )
+
+        if model == Person:
+            return queryset.select_related(
+                "date_birth", "date_death", "place_birth", "place_death"
+            ).prefetch_related(
+                "biographies",
+                "knows__roles",
+                "languages",
+                "main_places",
+                "member_of__roles",
+            )
+
+        if model == Organisation:
+            return queryset.prefetch_related(
+                "members__roles",
+                Prefetch(
+                    "resources", queryset=Resource.objects.select_related("title")
+                ),
+            )
+
+        return queryset
+
 
 def agent_list(request):
     return render(request, "agents/agent_list.html")
@@ -41,10 +96,11 @@ class AgentViewSet(BaseDocumentViewSet):
 
     filter_backends = [
         FilteringFilterBackend,
-        FacetedSearchFilterBackend,
+        CachedFacetedSearchFilterBackend,
         OrderingFilterBackend,
         DefaultOrderingFilterBackend,
         CompoundSearchFilterBackend,
+        SourceFieldsFilterBackend,
         # the suggester backend needs to be the last backend
         SuggesterFilterBackend,
     ]
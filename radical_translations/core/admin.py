@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db.models import Count, Prefetch
 from markdownx.admin import MarkdownxModelAdmin
 
 from radical_translations.core.models import (
@@ -125,3 +126,37 @@ class ResourceAdmin(MarkdownxModelAdmin):
 
     class Media:
         css = {"all": ("css/admin.css",)}
+
+    def get_queryset(self, request):
+        # the changelist columns are computed from the annotations and the
+        # prefetched data, so that the number of queries doesn't grow with the
+        # number of rows
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("title", "date")
+            .annotate(
+                connections=Count("relationships", distinct=True)
+                + Count("related_to", distinct=True)
+            )
+            .prefetch_related(
+                Prefetch(
+                    "contributions",
+                    queryset=Contribution.objects.select_related("agent")
+                    .prefetch_related("roles")
+                    # the order `Resource.get_contributions_for` returns
+                    .order_by("resource", "agent", "id"),
+                ),
+                "classifications__edition",
+                "languages__language",
+                Prefetch(
+                    "places", queryset=ResourcePlace.objects.select_related("place")
+                ),
+            )
+        )
+
+    def get_connections(self, obj):
+        return obj.connections
+
+    get_connections.admin_order_field = "connections"  # type: ignore
+    get_connections.short_description = "Connections"  # type: ignore
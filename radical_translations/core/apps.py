@@ -5,3 +5,6 @@ from django.utils.translation import gettext_lazy as _
 class CoreConfig(AppConfig):
     name = "radical_translations.core"
     verbose_name = _("Core")
+
+    def ready(self):
+        import radical_translations.core.signals  # noqa F401
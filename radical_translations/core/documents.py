@@ -1,8 +1,14 @@
-from django_elasticsearch_dsl import Document, fields
+from collections import defaultdict
+from itertools import chain
+from typing import Callable, Iterable, List, Optional
+
+from django.db.models import Prefetch, Q, prefetch_related_objects
+from django_elasticsearch_dsl import fields
 from django_elasticsearch_dsl.registries import registry
 from elasticsearch_dsl import analyzer, normalizer
 
 from controlled_vocabulary.models import ControlledTerm
+from radical_translations.core.graph import EDITION, SOURCE_TEXT, ResourceGraph
 from radical_translations.core.models import (
     Classification,
     Contribution,
@@ -13,6 +19,7 @@ from radical_translations.core.models import (
     Title,
 )
 from radical_translations.utils.documents import (
+    HashedDocument,
     get_agent_field,
     get_controlled_term_field,
     get_place_field,
@@ -30,8 +37,28 @@ lowercase_sort_normalizer = normalizer(
 copy_to_content = {"copy_to": "content"}
 
 
+class ParatextBundle:
+    """A resource with the tree of its paratexts, walked once per document and read
+    by all the `prepare_` methods that aggregate the paratexts. When the paratexts
+    are not prefetched, `load` is called to prefetch their relations."""
+
+    def __init__(self, resource: Resource, load: Optional[Callable] = None):
+        self.resource = resource
+        # loaded on the first use, shared by the contributions fields
+        self.contributions: Optional[List[Contribution]] = None
+
+        paratexts = [
+            relationship.resource
+            for relationship in resource.get_paratext_relationships()
+        ]
+        if paratexts and load and not hasattr(resource, "paratext_relationships"):
+            paratexts = load(paratexts)
+
+        self.paratexts = [ParatextBundle(paratext, load) for paratext in paratexts]
+
+
 @registry.register_document
-class ResourceDocument(Document):
+class ResourceDocument(HashedDocument):
     meta = fields.KeywordField()
     content = fields.TextField(attr="title.main_title", store=True)
 
@@ -90,20 +117,30 @@ class ResourceDocument(Document):
     is_translation = fields.BooleanField()
 
     has_date_radical = fields.KeywordField()
+    radical_markers = fields.IntegerField()
 
     authors = fields.ObjectField(
-        attr="get_authors_source_text",
         properties={"person": get_agent_field(options=copy_to_content)},
     )
 
     translated_from = get_controlled_term_field(options=copy_to_content)
 
+    # per document instance caches, declared here so that they are not stored as
+    # document fields
+    _graph = None
+    _bundle = None
+    _contributions = None
+    _source_texts = None
+    _source_texts_authors = None
+    _source_texts_languages = None
+
     class Index:
         name = "rt-resources"
 
     class Django:
         model = Resource
         fields = ["id"]
+        queryset_pagination = 250
 
         related_models = [
             Classification,
@@ -120,7 +157,7 @@ class ResourceDocument(Document):
         return (
             super()
             .get_queryset()
-            .exclude(relationships__relationship_type__label="paratext of")
+            .filter(_is_paratext=False)
             .select_related("title", "date")
         )
 
@@ -143,13 +180,260 @@ class ResourceDocument(Document):
         ):
             return related_instance.resource
 
+    def get_modified_queryset(self, since):
+        """Returns the resources to index that were modified after `since`, either
+        themselves or the rows their documents are prepared from. Resources with
+        modified paratexts are included with them, and the translations and other
+        editions of the modified resources, whose documents include the authors and
+        languages of their source texts, recursively."""
+        resources = Resource.objects.filter(
+            Q(modified__gt=since)
+            | Q(title__modified__gt=since)
+            | Q(date__modified__gt=since)
+            | Q(
+                pk__in=Contribution.objects.filter(
+                    Q(modified__gt=since) | Q(agent__modified__gt=since)
+                ).values("resource")
+            )
+            | Q(
+                pk__in=ResourceRelationship.objects.filter(
+                    modified__gt=since
+                ).values("resource")
+            )
+            | Q(
+                pk__in=Classification.objects.filter(modified__gt=since).values(
+                    "resource"
+                )
+            )
+            | Q(
+                pk__in=ResourceLanguage.objects.filter(modified__gt=since).values(
+                    "resource"
+                )
+            )
+            | Q(
+                pk__in=ResourcePlace.objects.filter(modified__gt=since).values(
+                    "resource"
+                )
+            )
+        )
+
+        ids = set(resources.values_list("pk", flat=True))
+        paratexts = ids
+
+        while paratexts:
+            paratexts = (
+                set(
+                    ResourceRelationship.objects.filter(
+                        resource__in=paratexts, relationship_type__label="paratext of"
+                    ).values_list("related_to", flat=True)
+                )
+                - ids
+            )
+            ids.update(paratexts)
+
+        dependents = ids
+
+        while dependents:
+            dependents = (
+                set(
+                    ResourceRelationship.objects.filter(
+                        related_to__in=dependents,
+                        relationship_type__label__in=[*SOURCE_TEXT, EDITION],
+                    ).values_list("resource", flat=True)
+                )
+                - ids
+            )
+            ids.update(dependents)
+
+        return self.get_queryset().filter(pk__in=ids)
+
+    def get_indexing_queryset(self):
+        """Walks the resources in chunks of `queryset_pagination` resources, loading
+        the relations of each chunk with a fixed number of queries, so that the
+        `prepare_` methods read from the prefetched objects."""
+        chunk_size = self.django.queryset_pagination
+        chunk = []
+
+        for resource in self.get_queryset().iterator(chunk_size=chunk_size):
+            chunk.append(resource)
+
+            if len(chunk) == chunk_size:
+                yield from self.prefetch_related(chunk)
+                chunk = []
+
+        if chunk:
+            yield from self.prefetch_related(chunk)
+
+    def prefetch_related(self, resources, source_texts: bool = True):
+        """Prefetches, for the `resources`, everything the `prepare_` methods read,
+        including the relations of their paratexts and, with `source_texts`, the
+        authors and languages of their source texts."""
+        classifications = Classification.objects.select_related("edition__vocabulary")
+        contributions = (
+            Contribution.objects.prefetch_related("agent", "roles")
+            # the order `Resource.get_contributions_for` returns
+            .order_by("resource", "agent", "id")
+        )
+        languages = ResourceLanguage.objects.select_related("language")
+        # only the paratexts are indexed from the relationships to the resources,
+        # prefetched into their own attribute to keep `related_to` complete
+        paratexts = ResourceRelationship.objects.filter(
+            relationship_type__label="paratext of"
+        ).select_related("relationship_type", "resource__title", "resource__date")
+        subjects = ControlledTerm.objects.select_related("vocabulary")
+
+        lookups = [
+            Prefetch(
+                "places",
+                queryset=ResourcePlace.objects.select_related("place__country"),
+            ),
+            Prefetch(
+                "relationships",
+                queryset=ResourceRelationship.objects.select_related(
+                    "relationship_type", "related_to__title"
+                ),
+            ),
+        ]
+
+        # the resources, their paratexts and the paratexts of their paratexts
+        for path in [
+            "",
+            "paratext_relationships__resource__",
+            "paratext_relationships__resource__" * 2,
+        ]:
+            lookups.extend(
+                [
+                    Prefetch(f"{path}classifications", queryset=classifications),
+                    Prefetch(f"{path}contributions", queryset=contributions),
+                    Prefetch(f"{path}languages", queryset=languages),
+                    Prefetch(f"{path}subjects", queryset=subjects),
+                    Prefetch(
+                        f"{path}related_to",
+                        queryset=paratexts,
+                        to_attr="paratext_relationships",
+                    ),
+                ]
+            )
+
+        prefetch_related_objects(resources, *lookups)
+
+        if source_texts:
+            self.load_source_texts(resources)
+
+        return resources
+
+    def prepare(self, instance):
+        self._bundle = self.get_bundle(instance)
+
+        try:
+            return super().prepare(instance)
+        finally:
+            self._bundle = None
+
+    def get_bundle(self, instance) -> ParatextBundle:
+        """Returns the paratexts bundle of the `instance`, shared by all the fields
+        of the document being prepared."""
+        if self._bundle is not None and self._bundle.resource is instance:
+            return self._bundle
+
+        return ParatextBundle(
+            instance,
+            lambda paratexts: self.prefetch_related(paratexts, source_texts=False),
+        )
+
+    def preload(self):
+        """Loads the whole resources graph, and the authors and languages of all the
+        source texts, once per document instance, so that the whole index can be
+        prepared with a fixed number of relationship queries."""
+        self._graph = ResourceGraph.load()
+        self._load_source_texts(self._graph.get_source_text_ids())
+
+    def load_contributions(self, resources):
+        """Loads the contributions, including paratext contributions, of all the
+        `resources` with a fixed number of queries."""
+        self._contributions = Resource.get_contributions_for(
+            resources, include_paratext=True
+        )
+
+    def get_contributions(self, instance):
+        bundle = self.get_bundle(instance)
+
+        if bundle.contributions is None:
+            bundle.contributions = self._get_contributions(instance)
+
+        return bundle.contributions
+
+    def _get_contributions(self, instance):
+        if instance.is_prefetched("contributions"):
+            return instance.get_contributions(include_paratext=True)
+
+        if self._contributions is None or instance.id not in self._contributions:
+            self.load_contributions([instance])
+
+        return self._contributions[instance.id]
+
+    def load_source_texts(self, resources: Iterable[Resource]):
+        """Loads the source texts of the `resources`, following only the
+        relationships reachable from them, and the authors and languages of those
+        source texts. Nothing is loaded when the document is preloaded."""
+        if self._graph is not None:
+            return
+
+        ids = [resource.id for resource in resources]
+        graph = ResourceGraph.load_source_texts(ids)
+
+        self._source_texts = {pk: graph.get_source_texts(pk) or [] for pk in ids}
+        self._load_source_texts(set(chain.from_iterable(self._source_texts.values())))
+
+    def get_source_texts(self, instance) -> List[int]:
+        if self._graph is not None:
+            return self._graph.get_source_texts(instance.id) or []
+
+        if self._source_texts is None or instance.id not in self._source_texts:
+            self.load_source_texts([instance])
+
+        return self._source_texts[instance.id]
+
+    def _load_source_texts(self, source_text_ids):
+        self._source_texts_authors = defaultdict(dict)
+        for contribution in (
+            Contribution.objects.filter(
+                resource_id__in=source_text_ids,
+                roles__label__in=["author", "translator"],
+            )
+            .select_related("agent__polymorphic_ctype")
+            .order_by("id")
+        ):
+            self._source_texts_authors[contribution.resource_id][
+                contribution.agent_id
+            ] = contribution.agent
+
+        self._source_texts_languages = defaultdict(dict)
+        for item in ResourceLanguage.objects.filter(
+            resource_id__in=source_text_ids
+        ).select_related("language"):
+            self._source_texts_languages[item.resource_id][
+                item.language_id
+            ] = item.language
+
+    def _get_source_texts_values(self, instance, name):
+        source_texts = self.get_source_texts(instance)
+        if not source_texts:
+            return []
+
+        values = {}
+        for resource_id in source_texts:
+            values.update(getattr(self, name)[resource_id])
+
+        return list(values.values())
+
     def prepare_meta(self, instance):
         if instance.is_original():
             return "source texts"
 
         meta = []
 
-        if instance.get_paratext():
+        if self.get_bundle(instance).paratexts:
             meta.append("paratexts")
 
         if instance.is_translation():
@@ -160,8 +444,8 @@ class ResourceDocument(Document):
     def prepare_title(self, instance):
         titles = [str(instance.title)]
 
-        for relationship in instance.get_paratext():
-            paratext = relationship.resource
+        for paratext in self.get_bundle(instance).paratexts:
+            paratext = paratext.resource
             if str(paratext.title) != str(instance.title):
                 titles.append(str(paratext.title))
 
@@ -171,13 +455,16 @@ class ResourceDocument(Document):
         return self._get_subjects(instance, ["fast-forms", "rt-agt"])
 
     def _get_subjects(self, instance, prefix):
+        return self._get_bundle_subjects(self.get_bundle(instance), prefix)
+
+    def _get_bundle_subjects(self, bundle, prefix):
         subjects = [
             {"label": item.label}
-            for item in instance.subjects.filter(vocabulary__prefix__in=prefix)
+            for item in bundle.resource.get_subjects_by_vocabularies(prefix)
         ]
 
-        for relationship in instance.get_paratext():
-            subjects.extend(self._get_subjects(relationship.resource, prefix))
+        for paratext in bundle.paratexts:
+            subjects.extend(self._get_bundle_subjects(paratext, prefix))
 
         if subjects:
             subjects.append({"label": "any"})
@@ -201,19 +488,17 @@ class ResourceDocument(Document):
     def prepare_year(self, instance):
         resource = self._get_resource(instance)
         if resource.date:
-            date_earliest = resource.date.get_date_earliest()
-            date_latest = resource.date.get_date_latest()
+            year_earliest = resource.date.year_earliest
+            year_latest = resource.date.year_latest
 
-            if date_earliest and date_latest:
-                return [
-                    year for year in range(date_earliest.year, date_latest.year + 1)
-                ]
+            if year_earliest and year_latest:
+                return [year for year in range(year_earliest, year_latest + 1)]
 
-            if date_earliest:
-                return date_earliest.year
+            if year_earliest:
+                return year_earliest
 
-            if date_latest:
-                return date_latest.year
+            if year_latest:
+                return year_latest
 
     def prepare_summary(self, instance):
         summaries = []
@@ -221,9 +506,9 @@ class ResourceDocument(Document):
         if instance.summary:
             summaries = [instance.summary]
 
-        for relationship in instance.get_paratext():
-            if relationship.resource.summary:
-                summaries.append(relationship.resource.summary)
+        for paratext in self.get_bundle(instance).paratexts:
+            if paratext.resource.summary:
+                summaries.append(paratext.resource.summary)
 
         return summaries
 
@@ -231,20 +516,19 @@ class ResourceDocument(Document):
         return self._get_classifications(instance, "rt-ppt")
 
     def _get_classifications(self, instance, prefix):
+        return self._get_bundle_classifications(self.get_bundle(instance), prefix)
+
+    def _get_bundle_classifications(self, bundle, prefix):
         classifications = [
             {
                 "edition": {"label": item.edition.label},
             }
-            for item in instance.classifications.filter(
-                edition__vocabulary__prefix=prefix
-            )
+            for item in bundle.resource.get_classifications_by_vocabulary(prefix)
             if item.edition.label.lower() not in ["original", "source-text"]
         ]
 
-        for relationship in instance.get_paratext():
-            classifications.extend(
-                self._get_classifications(relationship.resource, prefix)
-            )
+        for paratext in bundle.paratexts:
+            classifications.extend(self._get_bundle_classifications(paratext, prefix))
 
         if classifications:
             classifications.append({"edition": {"label": "any"}})
@@ -278,7 +562,7 @@ class ResourceDocument(Document):
                     }
                 ],
             }
-            for item in instance.get_contributions(include_paratext=True)
+            for item in self.get_contributions(instance)
         ]
 
         if contributions:
@@ -291,7 +575,7 @@ class ResourceDocument(Document):
     def prepare_published_as(self, instance):
         published_as = []
 
-        for item in instance.get_contributions(include_paratext=True):
+        for item in self.get_contributions(instance):
             if item.published_as:
                 published_as.append(item.published_as)
 
@@ -301,12 +585,15 @@ class ResourceDocument(Document):
         return published_as
 
     def prepare_languages(self, instance):
+        return self._get_bundle_languages(self.get_bundle(instance))
+
+    def _get_bundle_languages(self, bundle):
         languages = [
-            {"label": item.language.label} for item in instance.languages.all()
+            {"label": item.language.label} for item in bundle.resource.languages.all()
         ]
 
-        for relationship in instance.get_paratext():
-            languages.extend(self.prepare_languages(relationship.resource))
+        for paratext in bundle.paratexts:
+            languages.extend(self._get_bundle_languages(paratext))
 
         if languages:
             languages.append({"label": "any"})
@@ -392,14 +679,25 @@ class ResourceDocument(Document):
 
         return "no"
 
-    def prepare_translated_from(self, instance):
-        languages = []
+    def prepare_authors(self, instance):
+        return [
+            {
+                "person": {"id": agent.id, "name": agent.name}
+                if agent.is_person
+                else {}
+            }
+            for agent in self._get_source_texts_values(
+                instance, "_source_texts_authors"
+            )
+        ]
 
-        if instance.get_languages_source_text():
-            languages = [
-                {"label": language.label}
-                for language in instance.get_languages_source_text()
-            ]
+    def prepare_translated_from(self, instance):
+        languages = [
+            {"label": language.label}
+            for language in self._get_source_texts_values(
+                instance, "_source_texts_languages"
+            )
+        ]
 
         if languages:
             languages.append({"label": "any"})
@@ -0,0 +1,218 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.db.models.query import QuerySet
+
+from radical_translations.core.models import Resource, ResourceRelationship
+
+EDITION = "other edition"
+PARATEXT = "paratext of"
+SOURCE_TEXT = ["derivative of", "translation of"]
+
+
+class ResourceGraph:
+    """In-memory graph of the relationships between resources. It is loaded with a
+    fixed number of queries and resolves source texts, paratexts and editions for any
+    number of resources without going back to the database. Relationship cycles are
+    detected and never followed twice."""
+
+    def __init__(
+        self,
+        relationships: Iterable[Tuple[int, int, str]],
+        originals: Iterable[int],
+        resources: Optional[Iterable[Resource]] = None,
+    ):
+        self.originals: Set[int] = set(originals)
+
+        # resource id -> [(relationship type, related resource id)]
+        self.relationships: Dict[int, List[Tuple[str, int]]] = defaultdict(list)
+        self.related_to: Dict[int, List[Tuple[str, int]]] = defaultdict(list)
+
+        for resource_id, related_to_id, relationship_type in relationships:
+            self.relationships[resource_id].append((relationship_type, related_to_id))
+            self.related_to[related_to_id].append((relationship_type, resource_id))
+
+        self.resources: Dict[int, Resource] = {}
+        if resources is not None:
+            self.resources = {resource.id: resource for resource in resources}
+
+    @classmethod
+    def load(cls, resources: Optional[QuerySet] = None) -> "ResourceGraph":
+        """Loads the graph for all the relationships in the database. If a
+        `resources` queryset is given, the resources are kept in the graph to be
+        returned by `get_resources`."""
+        relationships = (
+            ResourceRelationship.objects.order_by("id")
+            .values_list("resource_id", "related_to_id", "relationship_type__label")
+            .iterator()
+        )
+        originals = Resource.objects.filter(_is_original=True).values_list(
+            "id", flat=True
+        )
+
+        return cls(relationships, originals, resources)
+
+    @classmethod
+    def load_source_texts(cls, resource_ids: Iterable[int]) -> "ResourceGraph":
+        """Loads the graph of the source text and other edition relationships
+        reachable from the resources with the given `resource_ids`, with one query per
+        level of other editions, enough to resolve the source texts of those
+        resources."""
+        ids = set(resource_ids)
+        relationships = []
+        related_ids = ids
+
+        while related_ids:
+            level = list(
+                ResourceRelationship.objects.filter(
+                    resource_id__in=related_ids,
+                    relationship_type__label__in=[*SOURCE_TEXT, EDITION],
+                )
+                .order_by("id")
+                .values_list("resource_id", "related_to_id", "relationship_type__label")
+            )
+            relationships.extend(level)
+
+            related_ids = {
+                related_to_id
+                for _, related_to_id, relationship_type in level
+                if relationship_type == EDITION
+            } - ids
+            ids.update(related_ids)
+
+        originals = Resource.objects.filter(pk__in=ids, _is_original=True).values_list(
+            "id", flat=True
+        )
+
+        return cls(relationships, originals)
+
+    def is_original(self, resource_id: int) -> bool:
+        return resource_id in self.originals
+
+    def is_paratext(self, resource_id: int) -> bool:
+        return len(self.get_related(resource_id, [PARATEXT])) > 0
+
+    def get_related(self, resource_id: int, relationship_types: List[str]) -> List[int]:
+        """Returns the ids of the resources `resource_id` has a relationship of one of
+        the `relationship_types` to."""
+        return [
+            related_to_id
+            for relationship_type, related_to_id in self.relationships[resource_id]
+            if relationship_type in relationship_types
+        ]
+
+    def get_related_from(
+        self, resource_id: int, relationship_types: List[str]
+    ) -> List[int]:
+        """Returns the ids of the resources that have a relationship of one of the
+        `relationship_types` to `resource_id`."""
+        return [
+            related_id
+            for relationship_type, related_id in self.related_to[resource_id]
+            if relationship_type in relationship_types
+        ]
+
+    def get_source_texts(self, resource_id: int) -> Optional[List[int]]:
+        """Returns the ids of the source texts of the resource, following other
+        editions recursively. Returns None for source texts, mirroring
+        `Resource.get_source_texts`."""
+        if self.is_original(resource_id):
+            return None
+
+        return list(self._get_source_texts(resource_id, set()))
+
+    def _get_source_texts(self, resource_id: int, visited: Set[int]) -> Set[int]:
+        visited.add(resource_id)
+        source_texts = set(self.get_related(resource_id, SOURCE_TEXT))
+
+        for edition_id in self.get_related(resource_id, [EDITION]):
+            if edition_id not in visited and not self.is_original(edition_id):
+                source_texts.update(self._get_source_texts(edition_id, visited))
+
+        return source_texts
+
+    def get_source_text_ids(self) -> Set[int]:
+        """Returns the ids of all the resources that are the source text of at least
+        one other resource."""
+        return {
+            related_to_id
+            for relationships in self.relationships.values()
+            for relationship_type, related_to_id in relationships
+            if relationship_type in SOURCE_TEXT
+        }
+
+    def get_paratext_of(self, resource_id: int) -> Optional[int]:
+        related = self.get_related(resource_id, [PARATEXT])
+        if related:
+            return related[0]
+
+        return None
+
+    def get_paratext_root(self, resource_id: int) -> Optional[int]:
+        """Follows the paratext relationships up from the resource and returns the id
+        of the first resource that is not a paratext. Returns None if the paratext
+        relationships form a cycle."""
+        visited = set()
+
+        while self.is_paratext(resource_id):
+            visited.add(resource_id)
+            resource_id = self.get_paratext_of(resource_id)
+
+            if resource_id in visited:
+                return None
+
+        return resource_id
+
+    def get_paratexts(self, resource_id: int, recursive: bool = False) -> List[int]:
+        """Returns the ids of the paratexts of the resource. If `recursive` is True it
+        also returns the paratexts of the paratexts."""
+        if not recursive:
+            return self.get_related_from(resource_id, [PARATEXT])
+
+        return self._walk(resource_id, lambda pk: self.get_related_from(pk, [PARATEXT]))
+
+    def get_edition_chain(self, resource_id: int) -> List[int]:
+        """Returns the ids of all the resources linked to the resource by other
+        edition relationships, in either direction, nearest first."""
+        return self._walk(
+            resource_id,
+            lambda pk: self.get_related(pk, [EDITION])
+            + self.get_related_from(pk, [EDITION]),
+        )
+
+    def _walk(self, resource_id: int, neighbours) -> List[int]:
+        visited = {resource_id}
+        queue = [resource_id]
+        walked = []
+
+        while queue:
+            for neighbour_id in neighbours(queue.pop(0)):
+                if neighbour_id not in visited:
+                    visited.add(neighbour_id)
+                    queue.append(neighbour_id)
+                    walked.append(neighbour_id)
+
+        return walked
+
+    def get_resources(self, ids: Iterable[int]) -> List[Resource]:
+        """Returns the resources for the given `ids`, fetching the ones not already in
+        the graph with a single query."""
+        ids = list(ids)
+        missing = [pk for pk in ids if pk not in self.resources]
+
+        if missing:
+            self.resources.update(
+                Resource.objects.select_related("title", "date").in_bulk(missing)
+            )
+
+        return [self.resources[pk] for pk in ids if pk in self.resources]
+
+    def get_resource(self, resource_id: Optional[int]) -> Optional[Resource]:
+        if resource_id is None:
+            return None
+
+        resources = self.get_resources([resource_id])
+        if resources:
+            return resources[0]
+
+        return None
@@ -4,6 +4,7 @@ import os
 from django.conf import settings
 from django.core.management.base import BaseCommand
 
+from radical_translations.core.graph import ResourceGraph
 from radical_translations.core.models import Resource
 
 
@@ -14,7 +15,10 @@ class Command(BaseCommand):
         self.stdout.write(
             "Exporting Resources into CSV file resources.csv ...", ending=" "
         )
-        resources = [resource.to_dict() for resource in Resource.objects.all()]
+        queryset = Resource.objects.select_related("title", "date")
+        graph = ResourceGraph.load(queryset)
+
+        resources = [resource.to_dict(graph) for resource in queryset]
 
         if not resources:
             self.stderr.write(self.style.NOTICE("No resources found!"))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from radical_translations.core.models import Resource
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the stored `Resource` radical markers from the dates, subjects, "
+        "classifications, contributions and paratexts."
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Refreshing resource radical markers ...", ending=" ")
+        updated = Resource.refresh_all_radical_markers()
+        self.stdout.write(self.style.SUCCESS(f"done, {updated} resources updated"))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from radical_translations.core.models import Resource
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the stored `Resource` classification flags (source text, "
+        "translation, paratext, etc.) from the classifications and relationships."
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Refreshing resource flags ...", ending=" ")
+        updated = Resource.refresh_all_flags()
+        self.stdout.write(self.style.SUCCESS(f"done, {updated} resources updated"))
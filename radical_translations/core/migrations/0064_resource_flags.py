@@ -0,0 +1,43 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0063_rename_field_notes_tmp_on_resource_to_notes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resource',
+            name='_has_other_edition',
+            field=models.BooleanField(db_index=True, default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='_has_paratext',
+            field=models.BooleanField(db_index=True, default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='_has_translation',
+            field=models.BooleanField(db_index=True, default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='_is_original',
+            field=models.BooleanField(db_index=True, default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='_is_translation',
+            field=models.BooleanField(db_index=True, default=False, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='resource',
+            name='_is_paratext',
+            field=models.BooleanField(db_index=True, default=False, editable=False),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:15
+
+from collections import defaultdict
+
+from django.db import migrations
+
+
+def load_flags(apps, _):
+    Classification = apps.get_model("core", "Classification")
+    Resource = apps.get_model("core", "Resource")
+    ResourceRelationship = apps.get_model("core", "ResourceRelationship")
+
+    editions = defaultdict(list)
+    for resource_id, label in Classification.objects.values_list(
+        "resource_id", "edition__label"
+    ):
+        editions[resource_id].append(label)
+
+    relationship_types = defaultdict(set)
+    related_to_types = defaultdict(set)
+    for resource_id, related_to_id, label in ResourceRelationship.objects.values_list(
+        "resource_id", "related_to_id", "relationship_type__label"
+    ):
+        relationship_types[resource_id].add(label)
+        related_to_types[related_to_id].add(label)
+
+    resources = list(Resource.objects.all())
+
+    for resource in resources:
+        labels = editions[resource.id]
+        types = relationship_types[resource.id]
+        related = related_to_types[resource.id]
+
+        resource._is_original = any(
+            term in label.lower()
+            for label in labels
+            for term in ["original", "source-text"]
+        )
+        resource._is_paratext = "paratext of" in types
+        resource._is_translation = not resource._is_original and (
+            "translation of" in types
+            or any("translation" in label for label in labels)
+            or "other edition" in types
+        )
+        resource._has_paratext = "paratext of" in related
+        resource._has_translation = "translation of" in related
+        resource._has_other_edition = "other edition" in related
+
+    Resource.objects.bulk_update(
+        resources,
+        [
+            "_is_original",
+            "_is_paratext",
+            "_is_translation",
+            "_has_paratext",
+            "_has_translation",
+            "_has_other_edition",
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0064_resource_flags"),
+    ]
+
+    operations = [migrations.RunPython(load_flags, migrations.RunPython.noop)]
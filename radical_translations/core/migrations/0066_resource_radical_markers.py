@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0065_load_resource_flags'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resource',
+            name='radical_markers',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+    ]
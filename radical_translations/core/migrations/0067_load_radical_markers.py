@@ -0,0 +1,70 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:40
+
+from collections import defaultdict
+
+from django.db import migrations
+
+
+def load_radical_markers(apps, _):
+    Classification = apps.get_model("core", "Classification")
+    Contribution = apps.get_model("core", "Contribution")
+    Resource = apps.get_model("core", "Resource")
+    ResourceRelationship = apps.get_model("core", "ResourceRelationship")
+
+    radical = {"controlledterm__label__contains": "radical"}
+
+    own_markers = defaultdict(int)
+    for through, field in [
+        (Resource.subjects.through, "resource_id"),
+        (Classification.classification.through, "classification__resource_id"),
+        (Contribution.classification.through, "contribution__resource_id"),
+    ]:
+        for resource_id in through.objects.filter(**radical).values_list(
+            field, flat=True
+        ):
+            own_markers[resource_id] += 1
+
+    paratexts = defaultdict(list)
+    for resource_id, related_to_id in ResourceRelationship.objects.filter(
+        relationship_type__label="paratext of"
+    ).values_list("resource_id", "related_to_id"):
+        paratexts[related_to_id].append(resource_id)
+
+    date_radical = set(
+        Resource.objects.filter(date__date_radical__isnull=False).values_list(
+            "id", flat=True
+        )
+    )
+
+    resources = list(Resource.objects.only("id", "_is_paratext"))
+
+    for resource in resources:
+        markers = 0
+        if not resource._is_paratext and resource.id in date_radical:
+            markers = 1
+
+        visited = set()
+        queue = [resource.id]
+        while queue:
+            resource_id = queue.pop()
+            if resource_id in visited:
+                continue
+
+            visited.add(resource_id)
+            markers = markers + own_markers[resource_id]
+            queue.extend(paratexts[resource_id])
+
+        resource.radical_markers = markers
+
+    Resource.objects.bulk_update(resources, ["radical_markers"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0066_resource_radical_markers"),
+    ]
+
+    operations = [
+        migrations.RunPython(load_radical_markers, migrations.RunPython.noop)
+    ]
@@ -1,8 +1,9 @@
-from typing import Dict, List, Optional
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 from django.conf import settings
 from django.db import models
-from django.db.models.query import QuerySet
+from django.db.models.query import QuerySet, RawQuerySet
 from model_utils.models import TimeStampedModel
 from markdownx.models import MarkdownxField
 
@@ -24,9 +25,23 @@ from radical_translations.utils.models import (
     place_to_dict_value,
 )
 
+if TYPE_CHECKING:
+    from radical_translations.core.graph import ResourceGraph  # noqa F401
+
 csv_field_sep = settings.EXPORT_FIELD_SEPARATOR
 csv_multi_sep = settings.EXPORT_MULTIVALUE_SEPARATOR
 
+FLAG_FIELDS = [
+    "_is_original",
+    "_is_paratext",
+    "_is_translation",
+    "_has_paratext",
+    "_has_translation",
+    "_has_other_edition",
+]
+# stored fields computed from the related objects, written by the refresh methods
+COMPUTED_FIELDS = [*FLAG_FIELDS, "radical_markers"]
+
 # These models are based on the BIBFRAME 2.0 Model
 # https://www.loc.gov/bibframe/docs/bibframe2-model.html
 
@@ -86,12 +101,101 @@ class Title(TimeStampedModel):
         return title
 
 
+class ResourceQuerySet(models.QuerySet):
+    def lineage(
+        self, resource_id: int, include_private: bool = True
+    ) -> RawQuerySet:
+        """Returns the resource `resource_id` and all the resources descending from
+        it, through the `Resource.LINEAGE_RELATIONSHIP_TYPES` relationships, in a
+        single recursive query. Each resource is annotated with its `depth`, the
+        `parent_id` and `relationship_type` it descends through, and the
+        `main_title`, `subtitle` and `date_display` to describe it. Resources reached
+        through more than one path are returned once per path, ordered by depth.
+        Relationship cycles are not followed."""
+        relationship_types = Resource.LINEAGE_RELATIONSHIP_TYPES
+        placeholders = ", ".join(["%s"] * len(relationship_types))
+
+        sql = f"""
+            WITH RECURSIVE lineage (resource_id, parent_id, relationship_type, depth,
+                path) AS (
+                SELECT r.id, CAST(NULL AS INTEGER), CAST(NULL AS TEXT), 0,
+                    ',' || CAST(r.id AS TEXT) || ','
+                FROM {Resource._meta.db_table} r
+                WHERE r.id = %s
+            UNION ALL
+                SELECT rr.resource_id, rr.related_to_id, CAST(t.label AS TEXT),
+                    l.depth + 1, l.path || CAST(rr.resource_id AS TEXT) || ','
+                FROM lineage l
+                JOIN {ResourceRelationship._meta.db_table} rr
+                    ON rr.related_to_id = l.resource_id
+                JOIN {ControlledTerm._meta.db_table} t
+                    ON t.id = rr.relationship_type_id
+                JOIN {Resource._meta.db_table} r ON r.id = rr.resource_id
+                WHERE t.label IN ({placeholders})
+                    AND (%s OR NOT r.is_private)
+                    AND l.depth < %s
+                    AND l.path NOT LIKE '%%,' || CAST(rr.resource_id AS TEXT) || ',%%'
+            )
+            SELECT r.id, r._is_paratext, r.is_private, l.parent_id,
+                l.relationship_type, l.depth, t.main_title, t.subtitle,
+                d.date_display
+            FROM lineage l
+            JOIN {Resource._meta.db_table} r ON r.id = l.resource_id
+            JOIN {Title._meta.db_table} t ON t.id = r.title_id
+            LEFT JOIN {Date._meta.db_table} d ON d.id = r.date_id
+            ORDER BY l.depth, l.relationship_type, t.main_title, r.id
+        """
+
+        return self.raw(
+            sql,
+            [
+                resource_id,
+                *relationship_types,
+                include_private,
+                Resource.LINEAGE_MAX_DEPTH,
+            ],
+        )
+
+
 class Resource(TimeStampedModel):
     """Resource reflecting a conceptual essence of a cataloging resource."""
 
-    _is_paratext = models.BooleanField(default=False, editable=False)
+    RELATED_RESOURCES_ORDERING = [
+        "resource__date",
+        "relationship_type",
+        "resource__title",
+    ]
+
+    # relationships followed, from the related resource to the resource, to build
+    # the lineage of a source text
+    LINEAGE_RELATIONSHIP_TYPES = [
+        "derivative of",
+        "other edition",
+        "paratext of",
+        "translation of",
+    ]
+    LINEAGE_MAX_DEPTH = 16
+
+    _is_paratext = models.BooleanField(default=False, editable=False, db_index=True)
     is_private = models.BooleanField(default=False)
 
+    # classification flags derived from the relationships and classifications, kept
+    # in sync by the signals in `radical_translations.core.signals`
+    _is_original = models.BooleanField(default=False, editable=False, db_index=True)
+    _is_translation = models.BooleanField(
+        default=False, editable=False, db_index=True
+    )
+    _has_paratext = models.BooleanField(default=False, editable=False, db_index=True)
+    _has_translation = models.BooleanField(
+        default=False, editable=False, db_index=True
+    )
+    _has_other_edition = models.BooleanField(
+        default=False, editable=False, db_index=True
+    )
+    radical_markers = models.PositiveIntegerField(
+        default=0, editable=False, db_index=True
+    )
+
     title = models.ForeignKey(
         Title,
         on_delete=models.CASCADE,
@@ -171,6 +275,8 @@ class Resource(TimeStampedModel):
         ),
     )
 
+    objects = ResourceQuerySet.as_manager()
+
     class Meta:
         ordering = ["title", "date"]
         unique_together = ["title", "date", "_is_paratext"]
@@ -186,6 +292,29 @@ class Resource(TimeStampedModel):
 
         return title
 
+    def save(self, *args, **kwargs):
+        """Saves the resource without its computed fields, kept up to date by the
+        signals, so that saving a resource loaded before they changed does not undo
+        the change. The computed fields are recomputed when named in
+        `update_fields`."""
+        if self.pk and not self._state.adding:
+            update_fields = kwargs.get("update_fields")
+
+            if update_fields is None:
+                kwargs["update_fields"] = [
+                    field.name
+                    for field in self._meta.concrete_fields
+                    if not field.primary_key and field.name not in COMPUTED_FIELDS
+                ]
+            else:
+                if set(FLAG_FIELDS) & set(update_fields):
+                    self.refresh_flags(commit=False)
+
+                if "radical_markers" in update_fields:
+                    self.radical_markers = self.compute_radical_markers()
+
+        super().save(*args, **kwargs)
+
     def get_authors(self) -> str:
         role = "author"
 
@@ -193,18 +322,20 @@ class Resource(TimeStampedModel):
             role = "translator"
 
         return "; ".join(
-            [c.agent.name for c in self.contributions.filter(roles__label=role)]
+            [c.agent.name for c in self.get_contributions_by_roles([role])]
         )
 
     get_authors.short_description = "Authors/translators"  # type: ignore
 
-    def get_authors_source_text(self) -> Optional[List[Agent]]:
+    def get_authors_source_text(
+        self, graph: Optional["ResourceGraph"] = None
+    ) -> Optional[List[Agent]]:
         if self.is_original():
             return None
 
         authors = []
 
-        source_texts = self.get_source_texts()
+        source_texts = self.get_source_texts(graph)
         if not source_texts:
             return None
 
@@ -212,42 +343,44 @@ class Resource(TimeStampedModel):
             authors.extend(
                 [
                     c.agent
-                    for c in resource.contributions.filter(
-                        roles__label__in=["author", "translator"]
+                    for c in resource.get_contributions_by_roles(
+                        ["author", "translator"]
                     )
                 ]
             )
 
         return list(set(authors))
 
-    def get_source_texts(self) -> Optional[List["Resource"]]:
+    def get_source_texts(
+        self, graph: Optional["ResourceGraph"] = None
+    ) -> Optional[List["Resource"]]:
         if self.is_original():
             return None
 
+        if graph is not None:
+            return graph.get_resources(graph.get_source_texts(self.id) or [])
+
         resources = []
 
-        for rel in self.relationships.filter(
-            relationship_type__label__in=[
-                "derivative of",
-                "translation of",
-            ]
-        ):
+        for rel in self.get_relationships_by_types(["derivative of", "translation of"]):
             resources.append(rel.related_to)
 
-        for rel in self.relationships.filter(relationship_type__label="other edition"):
+        for rel in self.get_relationships_by_types(["other edition"]):
             source_texts = rel.related_to.get_source_texts()
             if source_texts:
                 resources.extend(source_texts)
 
         return list(set(resources))
 
-    def get_languages_source_text(self) -> Optional[List["ResourceLanguage"]]:
+    def get_languages_source_text(
+        self, graph: Optional["ResourceGraph"] = None
+    ) -> Optional[List["ResourceLanguage"]]:
         if self.is_original():
             return None
 
         languages = []
 
-        for resource in self.get_source_texts():
+        for resource in self.get_source_texts(graph):
             languages.extend([rl.language for rl in resource.languages.all()])
 
         return list(set(languages))
@@ -282,16 +415,89 @@ class Resource(TimeStampedModel):
 
         return contributions
 
+    @staticmethod
+    def get_contributions_for(
+        resources: List["Resource"], include_paratext: bool = False
+    ) -> Dict[int, List["Contribution"]]:
+        """Returns the contributions of each of the `resources`, keyed by resource
+        id, in the same order as `get_contributions`, using a fixed number of
+        queries."""
+        resource_ids = [resource.id for resource in resources]
+
+        paratexts = defaultdict(list)
+        if include_paratext:
+            for related_to_id, resource_id in ResourceRelationship.objects.filter(
+                related_to_id__in=resource_ids, relationship_type__label="paratext of"
+            ).values_list("related_to_id", "resource_id"):
+                paratexts[related_to_id].append(resource_id)
+
+        by_resource = defaultdict(list)
+        for contribution in (
+            Contribution.objects.filter(
+                resource_id__in=resource_ids
+                + [pid for ids in paratexts.values() for pid in ids]
+            )
+            .select_related("resource")
+            # prefetched, not selected, to load the agents as persons and
+            # organisations
+            .prefetch_related("agent", "roles")
+            .order_by("resource", "agent", "id")
+        ):
+            by_resource[contribution.resource_id].append(contribution)
+
+        def by_role(resource_id, role, include_resource=True, include_paratext=False):
+            contributions = []
+
+            if include_resource:
+                contributions = [
+                    contribution
+                    for contribution in by_resource[resource_id]
+                    if any(r.label == role for r in contribution.roles.all())
+                ]
+
+            if include_paratext:
+                for paratext_id in paratexts[resource_id]:
+                    contributions.extend(by_role(paratext_id, role))
+
+            return contributions
+
+        contributions = {}
+
+        for resource_id in resource_ids:
+            items = []
+
+            for role in settings.CONTRIBUTION_MAIN_ROLES:
+                items.extend(by_role(resource_id, role))
+
+            for role in settings.CONTRIBUTION_MAIN_ROLES:
+                items.extend(
+                    by_role(
+                        resource_id,
+                        role,
+                        include_resource=False,
+                        include_paratext=include_paratext,
+                    )
+                )
+
+            for role in settings.CONTRIBUTION_OTHER_ROLES:
+                items.extend(
+                    by_role(resource_id, role, include_paratext=include_paratext)
+                )
+
+            contributions[resource_id] = list(dict.fromkeys(items).keys())
+
+        return contributions
+
     def get_contributions_by_role(
         self, role: str, include_resource: bool = True, include_paratext: bool = False
     ) -> Optional[List["Contribution"]]:
         contributions = []
 
         if include_resource:
-            contributions = list(self.contributions.filter(roles__label=role))
+            contributions = self.get_contributions_by_roles([role])
 
         if include_paratext:
-            for relationship in self.get_paratext():
+            for relationship in self.get_paratext_relationships():
                 contributions.extend(
                     relationship.resource.get_contributions_by_role(
                         role, include_paratext
@@ -300,6 +506,71 @@ class Resource(TimeStampedModel):
 
         return contributions
 
+    def get_contributions_by_roles(self, roles: List[str]) -> List["Contribution"]:
+        if self.is_prefetched("contributions"):
+            return [
+                contribution
+                for contribution in self.contributions.all()
+                if any(role.label in roles for role in contribution.roles.all())
+            ]
+
+        return list(self.contributions.filter(roles__label__in=roles))
+
+    def get_subjects_by_vocabularies(self, prefixes: List[str]) -> List[ControlledTerm]:
+        if self.is_prefetched("subjects"):
+            return [
+                subject
+                for subject in self.subjects.all()
+                if subject.vocabulary.prefix in prefixes
+            ]
+
+        return list(self.subjects.filter(vocabulary__prefix__in=prefixes))
+
+    def get_classifications_by_vocabulary(self, prefix: str) -> List["Classification"]:
+        if self.is_prefetched("classifications"):
+            return [
+                classification
+                for classification in self.classifications.all()
+                if classification.edition.vocabulary.prefix == prefix
+            ]
+
+        return list(self.classifications.filter(edition__vocabulary__prefix=prefix))
+
+    def get_relationships_by_types(
+        self, relationship_types: List[str]
+    ) -> List["ResourceRelationship"]:
+        if self.is_prefetched("relationships"):
+            return [
+                relationship
+                for relationship in self.relationships.all()
+                if relationship.relationship_type.label in relationship_types
+            ]
+
+        return list(
+            self.relationships.filter(relationship_type__label__in=relationship_types)
+        )
+
+    def get_paratext_relationships(self) -> List["ResourceRelationship"]:
+        if hasattr(self, "paratext_relationships"):
+            # prefetched with `Prefetch("related_to", to_attr=...)`, filtered to the
+            # paratext relationships
+            return self.paratext_relationships
+
+        if self.is_prefetched("related_to"):
+            return [
+                relationship
+                for relationship in self.related_to.all()
+                if relationship.relationship_type.label == "paratext of"
+            ]
+
+        return list(self.get_paratext())
+
+    def is_prefetched(self, name: str) -> bool:
+        """Returns True if the `name` relation has been loaded with
+        `prefetch_related`, in which case the helpers read the prefetched objects
+        instead of querying the database."""
+        return name in getattr(self, "_prefetched_objects_cache", {})
+
     def get_language_names(self) -> str:
         return "; ".join([rl.language.label for rl in self.languages.all()])
 
@@ -314,6 +585,11 @@ class Resource(TimeStampedModel):
         return range(0, self.get_radical_markers())
 
     def get_radical_markers(self) -> int:
+        return self.radical_markers
+
+    def compute_radical_markers(self) -> int:
+        """Counts the radical markers from the date, subjects, classifications and
+        contributions of the resource and of its paratexts."""
         markers = 0
 
         if not self.is_paratext() and self.has_date_radical():
@@ -348,15 +624,51 @@ class Resource(TimeStampedModel):
     def _is_radical_label(self, label):
         return "radical" in label
 
+    def refresh_radical_markers(self, commit: bool = True) -> int:
+        """Recomputes the radical markers and, if `commit` is True, stores them
+        without going through `save`."""
+        self.radical_markers = self.compute_radical_markers()
+
+        if commit and self.pk:
+            Resource.objects.filter(pk=self.pk).update(
+                radical_markers=self.radical_markers
+            )
+
+        return self.radical_markers
+
     def get_related_resources(self):
-        return self.related_to.order_by(
-            "resource__date", "relationship_type", "resource__title"
-        )
+        if self.is_prefetched("related_to"):
+            # expects the relationships to be prefetched in the
+            # `RELATED_RESOURCES_ORDERING` order
+            return self.related_to.all()
+
+        return self.related_to.order_by(*self.RELATED_RESOURCES_ORDERING)
 
     def get_subjects_topic(self) -> List[ControlledTerm]:
+        if self.is_prefetched("subjects"):
+            return sorted(
+                [
+                    subject
+                    for subject in self.subjects.all()
+                    if subject.vocabulary.prefix == "fast-topic"
+                ],
+                key=lambda subject: subject.label,
+            )
+
         return self.subjects.filter(vocabulary__prefix="fast-topic").order_by("label")
 
     def get_subjects_other(self) -> List[ControlledTerm]:
+        if self.is_prefetched("subjects"):
+            return sorted(
+                [
+                    subject
+                    for subject in self.subjects.all()
+                    if subject.vocabulary.prefix != "fast-topic"
+                    and subject.label != "radicalism"
+                ],
+                key=lambda subject: subject.label,
+            )
+
         return (
             self.subjects.exclude(vocabulary__prefix="fast-topic")
             .exclude(label="radicalism")
@@ -370,19 +682,13 @@ class Resource(TimeStampedModel):
         return False
 
     def is_original(self) -> bool:
-        return any(
-            term in self.get_classification_edition().lower()
-            for term in ["original", "source-text"]
-        )
+        return self._is_original
 
     is_original.boolean = True  # type: ignore
     is_original.short_description = "Is source text"
 
     def is_paratext(self) -> bool:
-        return (
-            self.relationships.filter(relationship_type__label="paratext of").count()
-            > 0
-        )
+        return self._is_paratext
 
     is_paratext.boolean = True  # type: ignore
 
@@ -390,28 +696,22 @@ class Resource(TimeStampedModel):
         return self.subjects.filter(label__iexact="radicalism").count() == 1
 
     def is_translation(self) -> bool:
-        return not self.is_original() and (
-            self.relationships.filter(relationship_type__label="translation of").count()
-            > 0
-            or self.classifications.filter(
-                edition__label__contains="translation"
-            ).count()
-            > 0
-            or self.relationships.filter(
-                relationship_type__label="other edition"
-            ).count()
-            > 0
-        )
+        return self._is_translation
 
     is_translation.boolean = True  # type: ignore
 
     def get_paratext(self) -> QuerySet:
         return self.related_to.filter(relationship_type__label="paratext of")
 
-    def paratext_of(self) -> Optional["Resource"]:
-        if not self.is_paratext:
+    def paratext_of(
+        self, graph: Optional["ResourceGraph"] = None
+    ) -> Optional["Resource"]:
+        if not self.is_paratext():
             return None
 
+        if graph is not None:
+            return graph.get_resource(graph.get_paratext_of(self.id))
+
         relationship = self.relationships.filter(
             relationship_type__label="paratext of"
         ).first()
@@ -420,8 +720,12 @@ class Resource(TimeStampedModel):
 
         return None
 
-    def get_date(self) -> Optional[Date]:
-        if self.is_paratext and not self.date:
+    def get_date(self, graph: Optional["ResourceGraph"] = None) -> Optional[Date]:
+        if self.is_paratext() and not self.date:
+            if graph is not None:
+                paratext_of = self.paratext_of(graph)
+                return paratext_of.date if paratext_of else None
+
             relationship = self.relationships.filter(
                 relationship_type__label="paratext of"
             ).first()
@@ -436,30 +740,222 @@ class Resource(TimeStampedModel):
         if self.is_translation():
             labels.append("translation")
 
-        if self.related_to.filter(relationship_type__label="translation of"):
+        if self._has_translation:
             labels.append("has translation")
 
         if self.is_paratext():
             labels.append("paratext")
 
-        if self.get_paratext():
+        if self._has_paratext:
             labels.append("has paratext")
 
-        if self.related_to.filter(relationship_type__label="other edition"):
+        if self._has_other_edition:
             labels.append("has other edition")
 
         return labels
 
+    def get_flags(self) -> Dict[str, bool]:
+        """Computes the classification flags from the current classifications and
+        relationships of the resource."""
+        return Resource.compute_flags(
+            self.classifications.values_list("edition__label", flat=True),
+            self.relationships.values_list("relationship_type__label", flat=True),
+            self.related_to.values_list("relationship_type__label", flat=True),
+        )
+
+    def refresh_flags(self, commit: bool = True) -> Dict[str, bool]:
+        """Recomputes the classification flags and, if `commit` is True, stores them
+        without going through `save`."""
+        flags = self.get_flags()
+
+        for name, value in flags.items():
+            setattr(self, name, value)
+
+        if commit and self.pk:
+            Resource.objects.filter(pk=self.pk).update(**flags)
+
+        return flags
+
+    @staticmethod
+    def compute_flags(
+        edition_labels: List[str],
+        relationship_types: List[str],
+        related_to_types: List[str],
+    ) -> Dict[str, bool]:
+        """Computes the classification flags from the edition labels of the resource
+        classifications, the types of the relationships from the resource and the
+        types of the relationships to the resource."""
+        edition_labels = list(edition_labels)
+        relationship_types = set(relationship_types)
+        related_to_types = set(related_to_types)
+
+        is_original = any(
+            term in label.lower()
+            for label in edition_labels
+            for term in ["original", "source-text"]
+        )
+
+        return {
+            "_is_original": is_original,
+            "_is_paratext": "paratext of" in relationship_types,
+            "_is_translation": not is_original
+            and (
+                "translation of" in relationship_types
+                or any("translation" in label for label in edition_labels)
+                or "other edition" in relationship_types
+            ),
+            "_has_paratext": "paratext of" in related_to_types,
+            "_has_translation": "translation of" in related_to_types,
+            "_has_other_edition": "other edition" in related_to_types,
+        }
+
+    @staticmethod
+    def refresh_all_flags(queryset: Optional[QuerySet] = None) -> int:
+        """Recomputes and stores the classification flags for all the resources in
+        the `queryset`, using a fixed number of queries. Returns the number of
+        resources updated."""
+        classifications = Classification.objects.all()
+        relationships = ResourceRelationship.objects.all()
+
+        if queryset is None:
+            queryset = Resource.objects.all()
+        else:
+            ids = queryset.values("id")
+            classifications = classifications.filter(resource_id__in=ids)
+            relationships = relationships.filter(
+                models.Q(resource_id__in=ids) | models.Q(related_to_id__in=ids)
+            )
+
+        editions = defaultdict(list)
+        for resource_id, label in classifications.values_list(
+            "resource_id", "edition__label"
+        ):
+            editions[resource_id].append(label)
+
+        relationship_types = defaultdict(list)
+        related_to_types = defaultdict(list)
+        for resource_id, related_to_id, label in relationships.values_list(
+            "resource_id", "related_to_id", "relationship_type__label"
+        ):
+            relationship_types[resource_id].append(label)
+            related_to_types[related_to_id].append(label)
+
+        changed = []
+        for resource in queryset.order_by().only("id", *FLAG_FIELDS):
+            flags = Resource.compute_flags(
+                editions[resource.id],
+                relationship_types[resource.id],
+                related_to_types[resource.id],
+            )
+            if any(getattr(resource, name) != value for name, value in flags.items()):
+                for name, value in flags.items():
+                    setattr(resource, name, value)
+                changed.append(resource)
+
+        Resource.objects.bulk_update(changed, FLAG_FIELDS, batch_size=500)
+
+        return len(changed)
+
+    @staticmethod
+    def refresh_all_radical_markers(queryset: Optional[QuerySet] = None) -> int:
+        """Recomputes and stores the radical markers for all the resources in the
+        `queryset`, using a fixed number of queries. Returns the number of resources
+        updated."""
+        from radical_translations.core.graph import ResourceGraph
+
+        radical = {"controlledterm__label__contains": "radical"}
+
+        own_markers = defaultdict(int)
+        for resource_id in (
+            list(
+                Resource.subjects.through.objects.filter(**radical).values_list(
+                    "resource_id", flat=True
+                )
+            )
+            + list(
+                Classification.classification.through.objects.filter(
+                    **radical
+                ).values_list("classification__resource_id", flat=True)
+            )
+            + list(
+                Contribution.classification.through.objects.filter(
+                    **radical
+                ).values_list("contribution__resource_id", flat=True)
+            )
+        ):
+            own_markers[resource_id] += 1
+
+        date_radical = set(
+            Resource.objects.filter(date__date_radical__isnull=False).values_list(
+                "id", flat=True
+            )
+        )
+
+        if queryset is None:
+            queryset = Resource.objects.all()
+
+        graph = ResourceGraph.load()
+
+        changed = []
+        for resource in queryset.order_by().only("id", "radical_markers"):
+            markers = own_markers[resource.id] + sum(
+                own_markers[paratext_id]
+                for paratext_id in graph.get_paratexts(resource.id, recursive=True)
+            )
+            if not graph.is_paratext(resource.id) and resource.id in date_radical:
+                markers = markers + 1
+
+            if resource.radical_markers != markers:
+                resource.radical_markers = markers
+                changed.append(resource)
+
+        Resource.objects.bulk_update(changed, ["radical_markers"], batch_size=500)
+
+        return len(changed)
+
+    def get_lineage(self, include_private: bool = True) -> Dict:
+        """Returns the lineage tree of the resource: the translations, other
+        editions, derivatives and paratexts descending from it, nested under the
+        resource they descend from."""
+        nodes = {}
+        lineage = None
+
+        for resource in Resource.objects.lineage(self.id, include_private):
+            if resource.id in nodes:
+                continue
+
+            node = {
+                "id": resource.id,
+                "title": str(
+                    Title(main_title=resource.main_title, subtitle=resource.subtitle)
+                ),
+                "date": resource.date_display,
+                "is_paratext": resource._is_paratext,
+                "is_private": resource.is_private,
+                "relationship_type": resource.relationship_type,
+                "depth": resource.depth,
+                "children": [],
+            }
+            nodes[resource.id] = node
+
+            if resource.parent_id is None:
+                lineage = node
+            else:
+                nodes[resource.parent_id]["children"].append(node)
+
+        return lineage
+
     def get_connections(self) -> int:
         return self.relationships.count() + self.related_to.count()
 
     get_connections.short_description = "Connections"  # type: ignore
 
-    def to_dict(self) -> Dict:
+    def to_dict(self, graph: Optional["ResourceGraph"] = None) -> Dict:
         return {
             "id": self.id,
+            "is_private": self.is_private,
             **self.title.to_dict(),
-            **date_to_dict(self.get_date()),
+            **date_to_dict(self.get_date(graph)),
             "subjects.topics": get_controlled_terms_str(self.get_subjects_topic()),
             "subjects.form_genre": get_controlled_terms_str(self.get_subjects_other()),
             "edition_enumeration": self.edition_enumeration,
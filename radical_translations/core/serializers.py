@@ -2,9 +2,10 @@ from django_elasticsearch_dsl_drf.serializers import DocumentSerializer
 from rest_framework import serializers
 
 from radical_translations.core.documents import ResourceDocument
+from radical_translations.utils.serializers import SourceFieldsSerializerMixin
 
 
-class ResourceDocumentSerializer(DocumentSerializer):
+class ResourceDocumentSerializer(SourceFieldsSerializerMixin, DocumentSerializer):
     highlight = serializers.SerializerMethodField()
 
     class Meta:
@@ -17,7 +18,7 @@ class ResourceDocumentSerializer(DocumentSerializer):
         return {}
 
 
-class SimpleResourceDocumentSerializer(DocumentSerializer):
+class SimpleResourceDocumentSerializer(SourceFieldsSerializerMixin, DocumentSerializer):
     class Meta:
         document = ResourceDocument
         fields = [
@@ -0,0 +1,219 @@
+from typing import Optional
+
+from django.apps import apps
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from radical_translations.agents.models import Agent, Organisation
+from radical_translations.core.models import (
+    FLAG_FIELDS,
+    Classification,
+    Contribution,
+    Resource,
+    ResourceRelationship,
+)
+from radical_translations.utils.models import Date
+
+
+def get_resource(instance, field_name: str) -> Optional[Resource]:
+    """Returns the resource referenced by the `field_name` foreign key of the
+    `instance`, reusing the cached object when available so that callers holding a
+    reference to it see the refreshed flags."""
+    field = instance._meta.get_field(field_name)
+
+    if field.is_cached(instance):
+        return field.get_cached_value(instance)
+
+    return Resource.objects.filter(pk=getattr(instance, field.attname)).first()
+
+
+def reindex(resource: Resource):
+    """Queues the resource to be indexed again. The stored flags and markers are
+    updated without going through `save`, so without the signals that index it."""
+    processor = apps.get_app_config("django_elasticsearch_dsl").signal_processor
+
+    if processor is not None:
+        processor.handle_save(Resource, resource)
+
+
+def refresh_flags(*resources: Optional[Resource]):
+    for resource in resources:
+        if resource is not None and resource.pk:
+            previous = {name: getattr(resource, name) for name in FLAG_FIELDS}
+
+            if resource.refresh_flags() != previous:
+                reindex(resource)
+
+
+def refresh_is_private(*agent_ids: Optional[int]):
+    agent_ids = [pk for pk in agent_ids if pk]
+    if agent_ids:
+        Agent.refresh_all_is_private(Agent.objects.filter(pk__in=agent_ids))
+
+
+def refresh_radical_markers(*resources: Optional[Resource]):
+    """Refreshes the radical markers of the resources and of the resources they are
+    paratexts of, which include the markers of their paratexts."""
+    visited = set()
+
+    for resource in resources:
+        while resource is not None and resource.pk and resource.pk not in visited:
+            visited.add(resource.pk)
+            previous = resource.radical_markers
+
+            if resource.refresh_radical_markers() != previous:
+                reindex(resource)
+
+            resource = resource.paratext_of()
+
+
+@receiver(post_save, sender=Classification)
+@receiver(post_delete, sender=Classification)
+def classification_changed(sender, instance, **kwargs):
+    resource = get_resource(instance, "resource")
+
+    refresh_flags(resource)
+    refresh_radical_markers(resource)
+
+
+@receiver(pre_save, sender=Contribution)
+def contribution_changing(sender, instance, **kwargs):
+    # keeps the agent the contribution was from before the change, its private flag
+    # also needs to be refreshed if the contribution is moved to another agent
+    instance._previous_agent_id = None
+
+    if instance.pk:
+        instance._previous_agent_id = (
+            Contribution.objects.filter(pk=instance.pk)
+            .values_list("agent_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Contribution)
+@receiver(post_delete, sender=Contribution)
+def contribution_changed(sender, instance, **kwargs):
+    refresh_radical_markers(get_resource(instance, "resource"))
+    refresh_is_private(
+        instance.agent_id, getattr(instance, "_previous_agent_id", None)
+    )
+
+
+@receiver(pre_save, sender=Resource)
+def resource_changing(sender, instance, update_fields=None, **kwargs):
+    # keeps the date the resource had before the change, the radical markers need to
+    # be refreshed if the resource is moved to another date
+    instance._previous_date_id = instance.date_id
+
+    if instance.pk and (update_fields is None or "date" in update_fields):
+        instance._previous_date_id = (
+            Resource.objects.filter(pk=instance.pk)
+            .order_by()
+            .values_list("date_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Resource)
+def resource_changed(sender, instance, created, update_fields=None, **kwargs):
+    previous_date_id = (
+        None if created else getattr(instance, "_previous_date_id", instance.date_id)
+    )
+    if instance.date_id != previous_date_id:
+        refresh_radical_markers(instance)
+
+    if update_fields is not None and "is_private" not in update_fields:
+        return
+
+    refresh_is_private(*instance.contributions.values_list("agent_id", flat=True))
+
+
+@receiver(m2m_changed, sender=Organisation.members.through)
+def members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        # the organisations an agent is cleared from are only known before the clear
+        instance._cleared_pks = list(instance.member_of.values_list("pk", flat=True))
+        return
+
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        return
+
+    if not reverse:
+        refresh_is_private(instance.pk)
+    elif action == "post_clear":
+        refresh_is_private(*getattr(instance, "_cleared_pks", []))
+    else:
+        refresh_is_private(*(pk_set or []))
+
+
+@receiver(post_save, sender=Date)
+def date_changed(sender, instance, **kwargs):
+    refresh_radical_markers(*Resource.objects.filter(date=instance))
+
+
+@receiver(m2m_changed, sender=Resource.subjects.through)
+@receiver(m2m_changed, sender=Classification.classification.through)
+@receiver(m2m_changed, sender=Contribution.classification.through)
+def classification_terms_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        # the objects cleared from a term are only known before the clear
+        instance._cleared_pks = list(
+            sender.objects.filter(controlledterm=instance).values_list(
+                sender._meta.get_field(kwargs["model"]._meta.model_name).attname,
+                flat=True,
+            )
+        )
+        return
+
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        return
+
+    if not reverse:
+        objects = [instance]
+    else:
+        if action == "post_clear":
+            pk_set = getattr(instance, "_cleared_pks", [])
+
+        objects = kwargs["model"].objects.filter(pk__in=pk_set or [])
+
+    refresh_radical_markers(
+        *[
+            obj if isinstance(obj, Resource) else get_resource(obj, "resource")
+            for obj in objects
+        ]
+    )
+
+
+@receiver(pre_save, sender=ResourceRelationship)
+def relationship_changing(sender, instance, **kwargs):
+    # keeps the resources the relationship linked before the change, their flags
+    # also need to be refreshed if the relationship is moved to other resources
+    instance._previous_resource_ids = []
+
+    if instance.pk:
+        instance._previous_resource_ids = list(
+            ResourceRelationship.objects.filter(pk=instance.pk)
+            .values_list("resource_id", "related_to_id")
+            .first()
+            or []
+        )
+
+
+@receiver(post_save, sender=ResourceRelationship)
+@receiver(post_delete, sender=ResourceRelationship)
+def relationship_changed(sender, instance, **kwargs):
+    current_ids = [instance.resource_id, instance.related_to_id]
+    previous_ids = [
+        pk
+        for pk in getattr(instance, "_previous_resource_ids", [])
+        if pk not in current_ids
+    ]
+
+    resources = [
+        get_resource(instance, "resource"),
+        get_resource(instance, "related_to"),
+        *Resource.objects.filter(pk__in=previous_ids),
+    ]
+
+    refresh_flags(*resources)
+    refresh_radical_markers(*resources)
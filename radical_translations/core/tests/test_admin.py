@@ -0,0 +1,41 @@
+from typing import Dict
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from radical_translations.core.models import Resource
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.usefixtures("vocabulary")
+class TestResourceAdmin:
+    @pytest.mark.usefixtures("entry_original", "entry_translation", "entry_edition")
+    def test_changelist_queries(
+        self,
+        admin_client,
+        entry_original: Dict[str, Dict[str, str]],
+        entry_translation: Dict[str, Dict[str, str]],
+        entry_edition: Dict[str, Dict[str, str]],
+    ):
+        url = reverse("admin:core_resource_changelist")
+
+        Resource.from_gsx_entry(entry_original)
+        admin_client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.get(url)
+            assert response.status_code == 200
+
+        for entry in [entry_translation, entry_edition]:
+            Resource.from_gsx_entry(entry)
+            Resource.relationships_from_gsx_entry(entry)
+
+        with CaptureQueriesContext(connection) as more_queries:
+            response = admin_client.get(url)
+            assert response.status_code == 200
+
+        assert Resource.objects.count() > 2
+        assert len(more_queries) == len(queries)
@@ -1,4 +1,5 @@
 import pytest
+from django.utils import timezone
 
 from controlled_vocabulary.utils import search_term_or_none
 from radical_translations.core.documents import ResourceDocument
@@ -132,6 +133,91 @@ class TestResourceDocument:
         search = ResourceDocument.search().query("match", places__fictional_place=label)
         assert len(search.execute()) == 1
 
+    @pytest.mark.usefixtures("entry_original", "entry_translation")
+    def test_get_indexing_queryset(self, entry_original, entry_translation):
+        original = Resource.from_gsx_entry(entry_original)
+        Resource.paratext_from_gsx_entry(entry_original, original)
+        Resource.from_gsx_entry(entry_translation)
+        Resource.relationships_from_gsx_entry(entry_translation)
+
+        doc = ResourceDocument()
+
+        resources = list(doc.get_indexing_queryset())
+        assert len(resources) == doc.get_queryset().count()
+
+        for resource in resources:
+            assert resource.is_prefetched("contributions")
+            # the paratexts do not replace the relationships to the resource
+            assert hasattr(resource, "paratext_relationships")
+            assert not resource.is_prefetched("related_to")
+            assert doc.prepare(resource) == doc.prepare(
+                Resource.objects.get(pk=resource.pk)
+            )
+
+    @pytest.mark.usefixtures("entry_original")
+    def test_get_modified_queryset(self, entry_original):
+        resource = Resource.from_gsx_entry(entry_original)
+        paratext = Resource.paratext_from_gsx_entry(entry_original, resource)
+
+        doc = ResourceDocument()
+        since = timezone.now()
+
+        assert doc.get_modified_queryset(since).count() == 0
+
+        paratext.title.main_title = "a different title"
+        paratext.title.save()
+
+        assert list(doc.get_modified_queryset(since)) == [resource]
+
+    @pytest.mark.usefixtures("entry_original", "entry_translation")
+    def test_get_modified_queryset_source_text(self, entry_original, entry_translation):
+        original = Resource.from_gsx_entry(entry_original)
+        Resource.from_gsx_entry(entry_translation)
+        translation = Resource.relationships_from_gsx_entry(entry_translation)
+
+        doc = ResourceDocument()
+        since = timezone.now()
+
+        assert doc.get_modified_queryset(since).count() == 0
+
+        # the translation document includes the authors of the source text
+        original.contributions.first().save()
+
+        assert set(doc.get_modified_queryset(since)) == {original, translation}
+
+    @pytest.mark.usefixtures("entry_original")
+    def test_get_bundle(self, entry_original):
+        resource = Resource.from_gsx_entry(entry_original)
+        paratext = Resource.paratext_from_gsx_entry(entry_original, resource)
+
+        doc = ResourceDocument()
+
+        bundle = doc.get_bundle(resource)
+        assert bundle.resource == resource
+        assert [p.resource for p in bundle.paratexts] == [paratext]
+        assert bundle.paratexts[0].paratexts == []
+
+        assert doc.get_bundle(resource) is not bundle
+        doc._bundle = bundle
+        assert doc.get_bundle(resource) is bundle
+
+    @pytest.mark.usefixtures("entry_original", "entry_translation")
+    def test_get_source_texts(self, entry_original, entry_translation):
+        original = Resource.from_gsx_entry(entry_original)
+        Resource.from_gsx_entry(entry_translation)
+        translation = Resource.relationships_from_gsx_entry(entry_translation)
+
+        doc = ResourceDocument()
+        doc.prefetch_related([translation])
+        assert doc._graph is None
+        assert doc.get_source_texts(translation) == [original.id]
+        assert doc.get_source_texts(original) == []
+
+        preloaded = ResourceDocument()
+        preloaded.preload()
+        assert preloaded.get_source_texts(translation) == [original.id]
+        assert preloaded.prepare(translation) == doc.prepare(translation)
+
     @pytest.mark.usefixtures("entry_original")
     def test_prepare_title(self, entry_original):
         doc = ResourceDocument()
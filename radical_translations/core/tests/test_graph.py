@@ -0,0 +1,88 @@
+from typing import Dict
+
+import pytest
+
+from radical_translations.core.graph import ResourceGraph
+from radical_translations.core.models import Resource
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def graph():
+    return ResourceGraph(
+        [
+            (2, 1, "translation of"),
+            (3, 2, "other edition"),
+            (4, 3, "other edition"),
+            (3, 4, "other edition"),
+            (5, 1, "paratext of"),
+            (6, 5, "paratext of"),
+            (7, 8, "paratext of"),
+            (8, 7, "paratext of"),
+        ],
+        [1],
+    )
+
+
+class TestResourceGraph:
+    def test_get_source_texts(self, graph):
+        assert graph.get_source_texts(1) is None
+        assert graph.get_source_texts(2) == [1]
+        assert graph.get_source_texts(4) == [1]
+        assert graph.get_source_texts(5) == []
+
+    def test_get_paratext_root(self, graph):
+        assert graph.get_paratext_root(1) == 1
+        assert graph.get_paratext_root(6) == 1
+        assert graph.get_paratext_root(7) is None
+
+    def test_get_paratexts(self, graph):
+        assert graph.get_paratexts(1) == [5]
+        assert graph.get_paratexts(1, recursive=True) == [5, 6]
+        assert graph.get_paratexts(7, recursive=True) == [8]
+
+    def test_get_edition_chain(self, graph):
+        assert graph.get_edition_chain(2) == [3, 4]
+        assert graph.get_edition_chain(4) == [3, 2]
+        assert graph.get_edition_chain(1) == []
+
+    @pytest.mark.usefixtures("entry_original", "entry_translation")
+    def test_load(
+        self,
+        entry_original: Dict[str, Dict[str, str]],
+        entry_translation: Dict[str, Dict[str, str]],
+    ):
+        original = Resource.from_gsx_entry(entry_original)
+        paratext = Resource.paratext_from_gsx_entry(entry_original, original)
+        Resource.from_gsx_entry(entry_translation)
+        translation = Resource.relationships_from_gsx_entry(entry_translation)
+
+        graph = ResourceGraph.load()
+        assert graph.is_original(original.id) is True
+        assert graph.is_paratext(paratext.id) is True
+        assert graph.get_paratext_root(paratext.id) == original.id
+
+        source_texts = translation.get_source_texts(graph)
+        assert source_texts == translation.get_source_texts()
+        assert paratext.get_date(graph) == paratext.get_date()
+
+    @pytest.mark.usefixtures("entry_original", "entry_translation")
+    def test_load_source_texts(
+        self,
+        entry_original: Dict[str, Dict[str, str]],
+        entry_translation: Dict[str, Dict[str, str]],
+    ):
+        original = Resource.from_gsx_entry(entry_original)
+        paratext = Resource.paratext_from_gsx_entry(entry_original, original)
+        Resource.from_gsx_entry(entry_translation)
+        translation = Resource.relationships_from_gsx_entry(entry_translation)
+
+        graph = ResourceGraph.load_source_texts([translation.id])
+        assert graph.get_source_texts(translation.id) == [original.id]
+        # the relationships not reachable from the resources are not loaded
+        assert graph.get_paratexts(original.id) == []
+
+        graph = ResourceGraph.load_source_texts([original.id, paratext.id])
+        assert graph.get_source_texts(original.id) is None
+        assert graph.get_source_texts(paratext.id) == []
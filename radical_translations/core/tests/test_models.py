@@ -2,7 +2,9 @@ from collections import defaultdict
 from typing import Dict
 
 import pytest
+from django.apps import apps
 
+from controlled_vocabulary.models import ControlledTerm, ControlledVocabulary
 from radical_translations.agents.models import Organisation, Person
 from radical_translations.core.models import (
     Classification,
@@ -188,6 +190,139 @@ class TestResource:
         resource = Resource.relationships_from_gsx_entry(entry_edition)
         assert resource.is_translation() is True
 
+    @pytest.mark.usefixtures("entry_original", "entry_translation")
+    def test_get_labels(
+        self,
+        entry_original: Dict[str, Dict[str, str]],
+        entry_translation: Dict[str, Dict[str, str]],
+    ):
+        original = Resource.from_gsx_entry(entry_original)
+        assert "has paratext" in original.get_labels()
+        assert "has translation" not in original.get_labels()
+
+        Resource.from_gsx_entry(entry_translation)
+        translation = Resource.relationships_from_gsx_entry(entry_translation)
+        assert "translation" in translation.get_labels()
+
+        original.refresh_from_db()
+        assert "has translation" in original.get_labels()
+
+    @pytest.mark.usefixtures("entry_original")
+    def test_refresh_flags(self, entry_original: Dict[str, Dict[str, str]]):
+        resource = Resource.from_gsx_entry(entry_original)
+        assert resource.is_original() is True
+
+        resource.classifications.all().delete()
+        resource.refresh_from_db()
+        assert resource.is_original() is False
+
+        Classification.get_or_create(resource, "source-text")
+        assert resource.is_original() is True
+
+        resource.refresh_from_db()
+        assert resource.is_original() is True
+
+    @pytest.mark.usefixtures("entry_original")
+    def test_refresh_flags_reindex(
+        self, monkeypatch, entry_original: Dict[str, Dict[str, str]]
+    ):
+        resource = Resource.from_gsx_entry(entry_original)
+
+        reindexed = []
+        monkeypatch.setattr(
+            apps.get_app_config("django_elasticsearch_dsl").signal_processor,
+            "handle_save",
+            lambda sender, instance, **kwargs: reindexed.append(instance.pk),
+        )
+
+        resource.classifications.all().delete()
+        assert set(reindexed) == {resource.pk}
+
+        reindexed.clear()
+        classification = Classification.get_or_create(resource, "source-text")
+        assert reindexed == [resource.pk]
+
+        # the flags are unchanged
+        reindexed.clear()
+        classification.save()
+        assert reindexed == []
+
+    @pytest.mark.usefixtures("entry_original")
+    def test_save(self, entry_original: Dict[str, Dict[str, str]]):
+        resource = Resource.from_gsx_entry(entry_original)
+        loaded = Resource.objects.get(pk=resource.pk)
+
+        resource.classifications.all().delete()
+        # does not undo the refreshed flags
+        loaded.save()
+        resource.refresh_from_db()
+        assert resource.is_original() is False
+
+        resource.date = Date.objects.create(date_display="1793", date_radical="II")
+        resource.save()
+        resource.refresh_from_db()
+        assert resource.get_radical_markers() == resource.compute_radical_markers()
+        assert resource.get_radical_markers() > 0
+
+    @pytest.mark.usefixtures("entry_original")
+    def test_refresh_all_flags(self, entry_original: Dict[str, Dict[str, str]]):
+        resource = Resource.from_gsx_entry(entry_original)
+        Resource.objects.filter(pk=resource.pk).update(
+            _is_original=False, _has_paratext=False
+        )
+
+        assert Resource.refresh_all_flags() == 1
+
+        resource.refresh_from_db()
+        assert resource.is_original() is True
+        assert "has paratext" in resource.get_labels()
+
+        assert Resource.refresh_all_flags() == 0
+
+    @pytest.mark.usefixtures("entry_original")
+    def test_refresh_radical_markers(self, entry_original: Dict[str, Dict[str, str]]):
+        radical = ControlledTerm.objects.create(
+            vocabulary=ControlledVocabulary.objects.get(prefix="wikidata"),
+            termid="pytest",
+            label="radical",
+        )
+
+        resource = Resource.from_gsx_entry(entry_original)
+        paratext = Resource.paratext_from_gsx_entry(entry_original, resource)
+        assert resource.get_radical_markers() == 0
+
+        resource.subjects.add(radical)
+        paratext.subjects.add(radical)
+        resource.refresh_from_db()
+        assert resource.get_radical_markers() == 2
+        assert resource.get_radical_markers() == resource.compute_radical_markers()
+
+        resource.date.date_radical = "year 1"
+        resource.date.save()
+        resource.refresh_from_db()
+        assert resource.get_radical_markers() == 3
+
+        paratext.delete()
+        resource.refresh_from_db()
+        assert resource.get_radical_markers() == 2
+
+    @pytest.mark.usefixtures("entry_original")
+    def test_refresh_all_radical_markers(
+        self, entry_original: Dict[str, Dict[str, str]]
+    ):
+        resource = Resource.from_gsx_entry(entry_original)
+        resource.date.date_radical = "year 1"
+        resource.date.save()
+
+        Resource.objects.filter(pk=resource.pk).update(radical_markers=0)
+
+        assert Resource.refresh_all_radical_markers() == 1
+
+        resource.refresh_from_db()
+        assert resource.get_radical_markers() == 1
+
+        assert Resource.refresh_all_radical_markers() == 0
+
     @pytest.mark.usefixtures("entry_original", "entry_edition")
     def test_get_authors(
         self,
@@ -218,6 +353,56 @@ class TestResource:
         assert authors is not None
         assert "Constantin" in authors[0].name
 
+    @pytest.mark.usefixtures("entry_original", "entry_translation", "person")
+    def test_get_contributions_for(
+        self,
+        entry_original: Dict[str, Dict[str, str]],
+        entry_translation: Dict[str, Dict[str, str]],
+        person: Person,
+    ):
+        original = Resource.from_gsx_entry(entry_original)
+        paratext = Resource.paratext_from_gsx_entry(entry_original, original)
+        Contribution.get_or_create(paratext, person, "editor")
+        Resource.from_gsx_entry(entry_translation)
+        translation = Resource.relationships_from_gsx_entry(entry_translation)
+
+        contributions = Resource.get_contributions_for([original, translation])
+        assert contributions[original.id] == original.get_contributions()
+        assert contributions[translation.id] == translation.get_contributions()
+
+        contributions = Resource.get_contributions_for(
+            [original, translation], include_paratext=True
+        )
+        assert contributions[original.id] == original.get_contributions(
+            include_paratext=True
+        )
+        assert contributions[original.id][-1].resource == paratext
+
+    @pytest.mark.usefixtures("entry_original", "entry_translation")
+    def test_get_lineage(
+        self,
+        entry_original: Dict[str, Dict[str, str]],
+        entry_translation: Dict[str, Dict[str, str]],
+    ):
+        original = Resource.from_gsx_entry(entry_original)
+        paratext = Resource.paratext_from_gsx_entry(entry_original, original)
+        Resource.from_gsx_entry(entry_translation)
+        translation = Resource.relationships_from_gsx_entry(entry_translation)
+
+        lineage = original.get_lineage()
+        assert lineage["id"] == original.id
+        assert lineage["depth"] == 0
+
+        children = {child["id"]: child for child in lineage["children"]}
+        assert children[paratext.id]["relationship_type"] == "paratext of"
+        assert children[translation.id]["relationship_type"] == "translation of"
+        assert children[translation.id]["depth"] == 1
+
+        translation.is_private = True
+        translation.save()
+        lineage = original.get_lineage(include_private=False)
+        assert translation.id not in [child["id"] for child in lineage["children"]]
+
     @pytest.mark.usefixtures("entry_original", "entry_translation")
     def test_get_source_texts(
         self,
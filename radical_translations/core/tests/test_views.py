@@ -0,0 +1,144 @@
+from typing import Dict
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from elasticsearch_dsl import Search
+from elasticsearch_dsl.response import Response
+
+from radical_translations.agents.models import Person
+from radical_translations.core.models import (
+    Contribution,
+    Resource,
+    ResourceRelationship,
+    Title,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.usefixtures("vocabulary")
+class TestResourceDetailView:
+    def add_paratexts(self, resource: Resource, person: Person, count: int):
+        for _ in range(count):
+            paratext = Resource.objects.create(
+                title=Title.get_or_create("untitled"), _is_paratext=True
+            )
+            ResourceRelationship.get_or_create(paratext, "paratext of", resource)
+            Contribution.get_or_create(paratext, person, "author")
+
+    @pytest.mark.usefixtures("entry_original", "person")
+    def test_get_queryset(
+        self, client, entry_original: Dict[str, Dict[str, str]], person: Person
+    ):
+        resource = Resource.from_gsx_entry(entry_original)
+        url = reverse("resource-detail", kwargs={"pk": resource.pk})
+
+        self.add_paratexts(resource, person, 1)
+        client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+            assert response.status_code == 200
+
+        self.add_paratexts(resource, person, 10)
+
+        with CaptureQueriesContext(connection) as more_queries:
+            response = client.get(url)
+            assert response.status_code == 200
+
+        assert resource.get_paratext().count() > 10
+        assert len(more_queries) == len(queries)
+
+
+@pytest.mark.usefixtures("vocabulary")
+class TestResourceLineage:
+    @pytest.mark.usefixtures("entry_original", "entry_translation")
+    def test_resource_lineage(
+        self,
+        client,
+        entry_original: Dict[str, Dict[str, str]],
+        entry_translation: Dict[str, Dict[str, str]],
+    ):
+        original = Resource.from_gsx_entry(entry_original)
+        Resource.from_gsx_entry(entry_translation)
+        translation = Resource.relationships_from_gsx_entry(entry_translation)
+
+        response = client.get(reverse("resource-lineage", kwargs={"pk": original.pk}))
+        assert response.status_code == 200
+        assert response.json()["children"][0]["id"] == translation.id
+
+        original.is_private = True
+        original.save()
+        response = client.get(reverse("resource-lineage", kwargs={"pk": original.pk}))
+        assert response.status_code == 403
+
+
+class TestGeoGrid:
+    def test_geo(self, client, monkeypatch):
+        searches = []
+
+        def execute(search):
+            searches.append(search.to_dict())
+            return Response(
+                search,
+                {
+                    "hits": {"total": {"value": 3, "relation": "eq"}, "hits": []},
+                    "aggregations": {
+                        "cells": {
+                            "buckets": [
+                                {
+                                    "key": "6/31/21",
+                                    "doc_count": 3,
+                                    "location": {
+                                        "location": {"lat": 51.5, "lon": -0.1},
+                                        "count": 3,
+                                    },
+                                    "sample": {
+                                        "hits": {
+                                            "hits": [
+                                                {
+                                                    "_id": "1",
+                                                    "_source": {
+                                                        "id": 1,
+                                                        "title": ["London"],
+                                                    },
+                                                }
+                                            ]
+                                        }
+                                    },
+                                }
+                            ]
+                        }
+                    },
+                },
+            )
+
+        monkeypatch.setattr(Search, "execute", execute)
+
+        response = client.get(
+            reverse("resource-api-geo"), {"zoom": 4, "language": "English"}
+        )
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["precision"] == 6
+        assert data["cells"] == [
+            {
+                "key": "6/31/21",
+                "count": 3,
+                "location": {"lat": 51.5, "lon": -0.1},
+                "sample": [{"id": 1, "title": ["London"]}],
+            }
+        ]
+
+        search = searches[0]
+        assert search["size"] == 0
+        assert search["aggs"]["cells"]["geotile_grid"]["precision"] == 6
+        # runs the same filters as the search, for the public resources only
+        assert "is_private" in str(search["query"])
+        assert "languages.label.raw" in str(search["query"])
+
+        response = client.get(reverse("resource-api-geo"), {"zoom": "far"})
+        assert response.status_code == 400
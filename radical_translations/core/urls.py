@@ -6,6 +6,7 @@ from radical_translations.core.views import (
     ResourceViewSet,
     SimpleResourceViewSet,
     network,
+    resource_lineage,
     resource_list,
 )
 
@@ -17,6 +18,7 @@ router.register(
 
 urlpatterns = [
     path("<int:pk>/", ResourceDetailView.as_view(), name="resource-detail"),
+    path("<int:pk>/lineage/", resource_lineage, name="resource-lineage"),
     path("", resource_list, name="resource-list"),
     path("network/", network, name="resource-network"),
 ] + router.urls
@@ -2,7 +2,9 @@ import igraph as ig
 import plotly.graph_objects as go
 from django.conf import settings
 from django.core.exceptions import PermissionDenied
-from django.shortcuts import render
+from django.db.models import Prefetch
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, render
 from django.views.generic.detail import DetailView
 from django_elasticsearch_dsl_drf.constants import (
     SUGGESTER_COMPLETION,
@@ -12,7 +14,6 @@ from django_elasticsearch_dsl_drf.constants import (
 from django_elasticsearch_dsl_drf.filter_backends import (
     CompoundSearchFilterBackend,
     DefaultOrderingFilterBackend,
-    FacetedSearchFilterBackend,
     FilteringFilterBackend,
     HighlightBackend,
     OrderingFilterBackend,
@@ -20,19 +21,31 @@ from django_elasticsearch_dsl_drf.filter_backends import (
 )
 from django_elasticsearch_dsl_drf.viewsets import DocumentViewSet
 from plotly.offline import plot
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 
 from radical_translations.agents.models import Agent, Person
 from radical_translations.core.documents import ResourceDocument
+from radical_translations.core.graph import ResourceGraph
 from radical_translations.core.models import (
+    Classification,
     Contribution,
     Resource,
+    ResourceLanguage,
+    ResourcePlace,
     ResourceRelationship,
 )
 from radical_translations.core.serializers import (
     ResourceDocumentSerializer,
     SimpleResourceDocumentSerializer,
 )
-from radical_translations.utils.search import PageNumberPagination
+from radical_translations.utils.search import (
+    CachedFacetedSearchFilterBackend,
+    PageNumberPagination,
+    SearchAfterPagination,
+    SourceFieldsFilterBackend,
+)
 
 ES_FACET_OPTIONS = settings.ES_FACET_OPTIONS
 ES_FUZZINESS_OPTIONS = settings.ES_FUZZINESS_OPTIONS
@@ -40,7 +53,7 @@ ES_FUZZINESS_OPTIONS = settings.ES_FUZZINESS_OPTIONS
 
 class BaseDetailView(DetailView):
     def get_object(self, queryset=None):
-        obj = super().get_object()
+        obj = super().get_object(queryset)
 
         if obj.is_private and not self.request.user.is_authenticated:
             raise PermissionDenied("This item is not public yet.")
@@ -51,12 +64,92 @@ class BaseDetailView(DetailView):
 class ResourceDetailView(BaseDetailView):
     model = Resource
 
+    def get_queryset(self):
+        # loads everything the detail template renders, including the related
+        # resources two levels deep and the paratexts contributions, so that the
+        # number of queries doesn't depend on the number of related resources
+        contributions = Contribution.objects.select_related("agent").prefetch_related(
+            "classification", "roles"
+        )
+        relationships = ResourceRelationship.objects.select_related(
+            "relationship_type", "related_to__title", "related_to__date"
+        )
+        related_to = ResourceRelationship.objects.select_related(
+            "relationship_type", "resource__title", "resource__date"
+        ).order_by(*Resource.RELATED_RESOURCES_ORDERING)
+
+        return (
+            super()
+            .get_queryset()
+            .select_related("title", "date")
+            .prefetch_related(
+                "subjects__vocabulary",
+                "held_by",
+                Prefetch(
+                    "classifications",
+                    queryset=Classification.objects.select_related(
+                        "edition__vocabulary"
+                    ).prefetch_related("classification"),
+                ),
+                Prefetch(
+                    "languages",
+                    queryset=ResourceLanguage.objects.select_related("language"),
+                ),
+                Prefetch(
+                    "places",
+                    queryset=ResourcePlace.objects.select_related(
+                        "place"
+                    ).prefetch_related("classification"),
+                ),
+                Prefetch(
+                    "contributions",
+                    queryset=contributions.order_by("resource", "agent", "id"),
+                ),
+                Prefetch("relationships", queryset=relationships),
+                Prefetch("relationships__related_to__relationships", relationships),
+                Prefetch("relationships__related_to__related_to", related_to),
+                Prefetch(
+                    "relationships__related_to__contributions",
+                    queryset=contributions.order_by("resource", "agent", "id"),
+                ),
+                Prefetch("related_to", queryset=related_to),
+                Prefetch("related_to__resource__relationships", relationships),
+                Prefetch("related_to__resource__related_to", related_to),
+                Prefetch(
+                    "related_to__resource__contributions",
+                    queryset=contributions.order_by("resource", "agent", "id"),
+                ),
+            )
+        )
+
 
 def resource_list(request):
     return render(request, "core/resource_list.html")
 
 
+def resource_lineage(request, pk):
+    resource = get_object_or_404(Resource, pk=pk)
+    authenticated = request.user.is_authenticated
+
+    if resource.is_private and not authenticated:
+        raise PermissionDenied("This item is not public yet.")
+
+    return JsonResponse(resource.get_lineage(include_private=authenticated))
+
+
 class BaseDocumentViewSet(DocumentViewSet):
+    @property
+    def paginator(self):
+        # the results are paginated with a cursor when one is given, even if empty
+        if (
+            not hasattr(self, "_paginator")
+            and self.action == "list"
+            and SearchAfterPagination.cursor_query_param in self.request.query_params
+        ):
+            self._paginator = SearchAfterPagination()
+
+        return super().paginator
+
     def get_queryset(self):
         queryset = super().get_queryset()
 
@@ -66,17 +159,83 @@ class BaseDocumentViewSet(DocumentViewSet):
         return queryset
 
 
-class ResourceViewSet(BaseDocumentViewSet):
+class GeoGridMixin:
+    """Adds a `geo` endpoint to a document viewset, that runs the filtered search and
+    returns its results aggregated in the `geotile_grid` cells of the `geo_field`,
+    with the number of results, their centroid and a sample of them in each cell.
+    The precision of the cells follows the map `zoom` query parameter."""
+
+    geo_field = "places.place.geo"
+    geo_sample_fields = ["id", "title"]
+    geo_sample_size = 5
+    # the cells are two zoom levels deeper than the map tiles, 16 cells per tile
+    geo_precision_offset = 2
+    geo_max_cells = 10000
+
+    @action(detail=False)
+    def geo(self, request):
+        try:
+            zoom = int(request.query_params.get("zoom", 4))
+        except ValueError:
+            raise ValidationError({"zoom": "A map zoom level is required."})
+
+        precision = min(max(zoom + self.geo_precision_offset, 0), 29)
+
+        queryset = (
+            self.filter_queryset(self.get_queryset())
+            .extra(size=0, track_total_hits=True)
+            .sort()
+        )
+        cells = queryset.aggs.bucket(
+            "cells",
+            "geotile_grid",
+            field=self.geo_field,
+            precision=precision,
+            size=self.geo_max_cells,
+        )
+        cells.metric("location", "geo_centroid", field=self.geo_field)
+        cells.metric(
+            "sample",
+            "top_hits",
+            size=self.geo_sample_size,
+            _source=self.geo_sample_fields,
+        )
+
+        response = queryset.execute()
+
+        return Response(
+            {
+                "count": response.hits.total.value,
+                "zoom": zoom,
+                "precision": precision,
+                "cells": [
+                    {
+                        "key": bucket.key,
+                        "count": bucket.doc_count,
+                        "location": bucket.location.location.to_dict(),
+                        "sample": [
+                            hit["_source"].to_dict()
+                            for hit in bucket.sample.hits.hits
+                        ],
+                    }
+                    for bucket in response.aggregations.cells.buckets
+                ],
+            }
+        )
+
+
+class ResourceViewSet(GeoGridMixin, BaseDocumentViewSet):
     document = ResourceDocument
     serializer_class = ResourceDocumentSerializer
 
     filter_backends = [
         FilteringFilterBackend,
-        FacetedSearchFilterBackend,
+        CachedFacetedSearchFilterBackend,
         OrderingFilterBackend,
         DefaultOrderingFilterBackend,
         CompoundSearchFilterBackend,
         HighlightBackend,
+        SourceFieldsFilterBackend,
         # the suggester backend needs to be the last backend
         SuggesterFilterBackend,
     ]
@@ -187,6 +346,7 @@ class ResourceViewSet(BaseDocumentViewSet):
         "status": "relationships.relationship_type.label.raw",
         "subject": "subjects.label.raw",
         "radical_date": "has_date_radical",
+        "radical_markers": "radical_markers",
         "meta": "meta",
     }
 
@@ -213,6 +373,7 @@ class ResourceViewSet(BaseDocumentViewSet):
     ordering_fields = {
         "title": "title.sort",
         "year": "year",
+        "radical_markers": "radical_markers",
     }
     ordering = ["_score", "title.sort", "year"]
 
@@ -239,16 +400,17 @@ class ResourceViewSet(BaseDocumentViewSet):
     }
 
 
-class SimpleResourceViewSet(BaseDocumentViewSet):
+class SimpleResourceViewSet(GeoGridMixin, BaseDocumentViewSet):
     document = ResourceDocument
     serializer_class = SimpleResourceDocumentSerializer
 
     filter_backends = [
         FilteringFilterBackend,
-        FacetedSearchFilterBackend,
+        CachedFacetedSearchFilterBackend,
         OrderingFilterBackend,
         DefaultOrderingFilterBackend,
         CompoundSearchFilterBackend,
+        SourceFieldsFilterBackend,
     ]
 
     lookup_field = "id"
@@ -286,9 +448,10 @@ class SimpleResourceViewSet(BaseDocumentViewSet):
 
 def network(request):
     g = ig.Graph(directed=True)
+    graph = ResourceGraph.load()
 
-    for resource in Resource.objects.exclude(
-        relationships__relationship_type__label="paratext of"
+    for resource in Resource.objects.filter(_is_paratext=False).select_related(
+        "title", "date"
     ):
         group = 2
         title = "Translation: "
@@ -301,57 +464,37 @@ def network(request):
 
         g.add_vertex(name=f"resource-{resource.id}", title=title, group=group)
 
-    for agent in Agent.objects.exclude(roles__label__in=["archives", "library"]):
+    for agent in Agent.objects.exclude(
+        roles__label__in=["archives", "library"]
+    ).select_related("polymorphic_ctype"):
         group = 4 if agent.is_organisation else 3
         g.add_vertex(name=f"agent-{agent.id}", title=str(agent), group=group)
 
-    for contribution in Contribution.objects.all():
-        resource = contribution.resource
-        while resource.is_paratext():
-            next_resource = resource.paratext_of()
-            if next_resource.id == resource.id:
-                resource = None
-                break
+    for contribution in Contribution.objects.prefetch_related("roles"):
+        resource_id = graph.get_paratext_root(contribution.resource_id)
 
-            resource = next_resource
-
-        if resource:
+        if resource_id:
             for role in contribution.roles.all():
                 g.add_edge(
-                    f"agent-{contribution.agent.id}",
-                    f"resource-{resource.id}",
+                    f"agent-{contribution.agent_id}",
+                    f"resource-{resource_id}",
                     label=role.label,
                 )
 
     for relationship in ResourceRelationship.objects.exclude(
         relationship_type__label="paratext of"
-    ):
-        resource = relationship.resource
-        while resource.is_paratext():
-            next_resource = resource.paratext_of()
-            if next_resource.id == resource.id:
-                resource = None
-                break
-
-            resource = next_resource
-
-        related_to = relationship.related_to
-        while related_to.is_paratext():
-            next_resource = related_to.paratext_of()
-            if next_resource.id == related_to.id:
-                related_to = None
-                break
-
-            related_to = next_resource
+    ).select_related("relationship_type"):
+        resource_id = graph.get_paratext_root(relationship.resource_id)
+        related_to_id = graph.get_paratext_root(relationship.related_to_id)
 
-        if resource and related_to:
+        if resource_id and related_to_id:
             g.add_edge(
-                f"resource-{resource.id}",
-                f"resource-{related_to.id}",
+                f"resource-{resource_id}",
+                f"resource-{related_to_id}",
                 label=relationship.relationship_type.label,
             )
 
-    for person in Person.objects.all():
+    for person in Person.objects.prefetch_related("knows", "member_of"):
         for knows in person.knows.all():
             g.add_edge(f"agent-{person.id}", f"agent-{knows.id}", label="knows")
 
@@ -1,16 +1,23 @@
-from django_elasticsearch_dsl import Document, fields
+from django.db.models import Q
+from django_elasticsearch_dsl import fields
 from django_elasticsearch_dsl.registries import registry
 
 from controlled_vocabulary.models import ControlledTerm
-from geonames_place.models import Country, Place
+from geonames_place.models import Place
 from radical_translations.core.models import Resource
 from radical_translations.events.models import Event
-from radical_translations.utils.documents import get_place_field, get_resource_field
+from radical_translations.utils.documents import (
+    HashedDocument,
+    get_country_name,
+    get_place_field,
+    get_resource_field,
+    is_country_name,
+)
 from radical_translations.utils.models import Date
 
 
 @registry.register_document
-class EventDocument(Document):
+class EventDocument(HashedDocument):
     title = fields.TextField()
     date = fields.TextField()
 
@@ -33,7 +40,7 @@ class EventDocument(Document):
         fields = ["id"]
 
     def get_queryset(self):
-        return super().get_queryset().select_related("date")
+        return super().get_queryset().select_related("date", "place")
 
     def get_instances_from_related(self, related_instance):
         if isinstance(related_instance, Date):
@@ -42,32 +49,44 @@ class EventDocument(Document):
         if isinstance(related_instance, (ControlledTerm, Place, Resource)):
             return related_instance.events.all()
 
+    def get_modified_queryset(self, since):
+        """Returns the events to index that were modified after `since`, either
+        themselves, their dates or the resources they are related to."""
+        return self.get_queryset().filter(
+            Q(modified__gt=since)
+            | Q(date__modified__gt=since)
+            | Q(
+                pk__in=Event.related_to.through.objects.filter(
+                    Q(resource__modified__gt=since)
+                    | Q(resource__title__modified__gt=since)
+                ).values("event")
+            )
+        )
+
     def prepare_date(self, instance):
         return str(instance.date)
 
     def prepare_date_earliest(self, instance):
-        if instance.date and instance.date.date_earliest:
-            return instance.date.get_date_earliest()
+        if instance.date:
+            return instance.date.date_lower
 
     def prepare_date_latest(self, instance):
-        if instance.date and instance.date.date_latest:
-            return instance.date.get_date_latest()
+        if instance.date:
+            return instance.date.date_upper
 
     def prepare_year(self, instance):
         if instance.date:
-            date_earliest = instance.date.get_date_earliest()
-            date_latest = instance.date.get_date_latest()
+            year_earliest = instance.date.year_earliest
+            year_latest = instance.date.year_latest
 
-            if date_earliest and date_latest:
-                return [
-                    year for year in range(date_earliest.year, date_latest.year + 1)
-                ]
+            if year_earliest and year_latest:
+                return [year for year in range(year_earliest, year_latest + 1)]
 
-            if date_earliest:
-                return date_earliest.year
+            if year_earliest:
+                return year_earliest
 
-            if date_latest:
-                return date_latest.year
+            if year_latest:
+                return year_latest
 
     def prepare_classification(self, instance):
         labels = []
@@ -75,10 +94,7 @@ class EventDocument(Document):
         for c in instance.classification.all():
             label = c.label
 
-            if (
-                Country.objects.filter(name=label).count() == 0
-                and label.lower() != "comparative"
-            ):
+            if not is_country_name(label) and label.lower() != "comparative":
                 labels.append(label)
 
         return labels
@@ -87,11 +103,11 @@ class EventDocument(Document):
         if not instance.place:
             return []
 
-        countries = [instance.place.country.name]
+        countries = [get_country_name(instance.place.country_id)]
 
         for c in instance.classification.all():
             label = c.label
-            if Country.objects.filter(name=label).count() > 0:
+            if is_country_name(label):
                 countries.append(label)
 
         return countries
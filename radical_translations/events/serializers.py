@@ -1,8 +1,9 @@
 from django_elasticsearch_dsl_drf.serializers import DocumentSerializer
 
 from radical_translations.events.documents import EventDocument
+from radical_translations.utils.serializers import SourceFieldsSerializerMixin
 
 
-class EventDocumentSerializer(DocumentSerializer):
+class EventDocumentSerializer(SourceFieldsSerializerMixin, DocumentSerializer):
     class Meta:
         document = EventDocument
@@ -5,7 +5,6 @@ from django.views.generic.detail import DetailView
 from django_elasticsearch_dsl_drf.filter_backends import (
     CompoundSearchFilterBackend,
     DefaultOrderingFilterBackend,
-    FacetedSearchFilterBackend,
     FilteringFilterBackend,
     OrderingFilterBackend,
 )
@@ -14,7 +13,11 @@ from django_elasticsearch_dsl_drf.viewsets import DocumentViewSet
 from radical_translations.events.documents import EventDocument
 from radical_translations.events.models import Event
 from radical_translations.events.serializers import EventDocumentSerializer
-from radical_translations.utils.search import PageNumberPagination
+from radical_translations.utils.search import (
+    CachedFacetedSearchFilterBackend,
+    PageNumberPagination,
+    SourceFieldsFilterBackend,
+)
 
 ES_FACET_OPTIONS = settings.ES_FACET_OPTIONS
 
@@ -33,10 +36,11 @@ class EventViewSet(DocumentViewSet):
 
     filter_backends = [
         FilteringFilterBackend,
-        FacetedSearchFilterBackend,
+        CachedFacetedSearchFilterBackend,
         OrderingFilterBackend,
         DefaultOrderingFilterBackend,
         CompoundSearchFilterBackend,
+        SourceFieldsFilterBackend,
     ]
 
     lookup_field = "id"
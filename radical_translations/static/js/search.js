@@ -16,6 +16,7 @@ new Vue({
   data: {
     url: new URL(`${baseURL}api/`),
     urlResources: new URL(`${baseURL}../resources/api-simple/`),
+    urlGeo: new URL(`${baseURL}api/geo/`),
     urlSuggest: new URL(`${baseURL}api/suggest/`),
     options: options,
     query: "",
@@ -31,6 +32,8 @@ new Vue({
     rangeMarks: (v) => v % 10 === 0,
     data: [],
     data_suggest: [],
+    // filter state of the last facets, they are only requested when it changes
+    facets_state: null,
     // resultsElement: "result-views",
     map: {
       mapObject: null,
@@ -46,7 +49,9 @@ new Vue({
       popup: {
         item: null,
         place: null,
+        cell: null,
       },
+      cells: [],
     },
     resources: {},
     timeline: { filters: {} },
@@ -75,7 +80,9 @@ new Vue({
     "map.show": async function (newShow, oldShow) {
       if (newShow) {
         this.page = 1;
-        this.page_size = 2000;
+        if (!options.map_geo) {
+          this.page_size = 1000;
+        }
         dispatchWindowResizeEvent();
       } else {
         this.page_size = options.page_size;
@@ -211,6 +218,9 @@ new Vue({
 
       return facets;
     }),
+    getFacetsState: function () {
+      return JSON.stringify([this.query, this.query_dates, this.filters]);
+    },
     getFacetCount: function (buckets) {
       return buckets
         .map((el) => el.doc_count)
@@ -291,7 +301,23 @@ new Vue({
       await this.search();
     },
     search: async function () {
-      this.data = await this.doSearch();
+      const facetsState = this.getFacetsState();
+      const facets = facetsState !== this.facets_state ? "all" : "none";
+
+      const data = await this.doSearch(
+        this.url,
+        this.page_size,
+        this.query_dates[0],
+        this.query_dates[1],
+        this.map.show && !options.map_geo,
+        facets
+      );
+
+      if (facets === "none") {
+        data.facets = this.data.facets;
+      }
+      this.facets_state = facetsState;
+      this.data = data;
 
       if (options.resources) {
         this.resources = await this.doSearch(
@@ -304,15 +330,27 @@ new Vue({
         this.timeline = this.getTimeline();
       }
       if (this.map.show) {
+        if (options.map_geo) {
+          this.map.cells = (await this.getGeo()).cells;
+        }
         this.renderMap();
       }
     },
+    getGeo: async function () {
+      // the search parameters of the page, as set by the last search
+      const params = new URLSearchParams(window.location.search);
+      params.set("zoom", this.map.zoom);
+
+      this.urlGeo.search = params.toString();
+      return await fetch(this.urlGeo).then((response) => response.json());
+    },
     doSearch: async function (
       url = this.url,
       page_size = this.page_size,
       year_from = this.query_dates[0],
       year_to = this.query_dates[1],
-      all = false
+      all = false,
+      facets = "none"
     ) {
       const params = new URLSearchParams();
 
@@ -337,7 +375,9 @@ new Vue({
         this.page = 1;
       }
 
-      params.append("page", this.page);
+      if (!all) {
+        params.append("page", this.page);
+      }
       params.append("page_size", page_size);
 
       if (this.ordering !== this.ordering_default) {
@@ -348,8 +388,20 @@ new Vue({
         params.append(`${filter[0]}__term`, filter[1])
       );
 
+      // not part of the page url, the facets depend on the search state
+      const search = params.toString();
+      window.history.pushState({}, "", search ? `?${search}` : "");
+
+      params.append("facets", facets);
+      if (url === this.url && options.fields) {
+        // only loads the fields of the results used by the page
+        params.append("fields", options.fields.join(","));
+      }
+      if (all) {
+        // walks through all the results with a cursor, following the next links
+        params.append("cursor", "");
+      }
       url.search = params.toString();
-      window.history.pushState({}, "", url.search);
 
       let json = {};
       do {
@@ -407,6 +459,11 @@ new Vue({
       const map = this.getMap();
       if (!map) return;
 
+      if (options.map_geo) {
+        this.renderCells(map);
+        return;
+      }
+
       const cluster = L.markerClusterGroup();
 
       const vue = this;
@@ -439,6 +496,43 @@ new Vue({
 
       map.whenReady(() => map.invalidateSize());
     },
+    renderCells: function (map) {
+      const vue = this;
+
+      this.map.cells.forEach((cell) =>
+        L.marker(cell.location, {
+          icon: L.divIcon({
+            className: "marker-cluster marker-cluster-small",
+            html: `<div><span>${cell.count}</span></div>`,
+            iconSize: L.point(40, 40),
+          }),
+        })
+          .on("click", function () {
+            const marker = this;
+
+            vue.map.popup.cell = cell;
+
+            vue.$nextTick(() =>
+              marker
+                .bindPopup(
+                  document.getElementById("map-popup-container").innerHTML
+                )
+                .openPopup()
+            );
+          })
+          .addTo(map)
+      );
+
+      // the cells are loaded again for the precision of the new zoom level
+      map.on("zoomend", async function () {
+        vue.map.zoom = map.getZoom();
+        vue.map.center = map.getCenter();
+        vue.map.cells = (await vue.getGeo()).cells;
+        vue.renderMap();
+      });
+
+      map.whenReady(() => map.invalidateSize());
+    },
     getTimeline: function () {
       const timeline = { filters: {} };
 
@@ -6,7 +6,7 @@ from geonames_place.models import Place
 
 from radical_translations.agents.admin import AgentInline
 from radical_translations.events.admin import EventInline
-from radical_translations.utils.models import Date
+from radical_translations.utils.models import Date, IndexQueueItem
 
 
 @admin.register(Date)
@@ -21,6 +21,20 @@ class DateAdmin(admin.ModelAdmin):
     search_fields = ["date_display", "date_radical"]
 
 
+@admin.register(IndexQueueItem)
+class IndexQueueItemAdmin(admin.ModelAdmin):
+    """Objects waiting to be indexed by the `process_index_queue` command."""
+
+    list_display = ["index", "object_id", "created"]
+    list_filter = ["index"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(LogEntry)
 class LogEntryAdmin(admin.ModelAdmin):
     """Log Entry admin interface."""
@@ -5,3 +5,6 @@ from django.utils.translation import gettext_lazy as _
 class UtilsConfig(AppConfig):
     name = "radical_translations.utils"
     verbose_name = _("Utils")
+
+    def ready(self):
+        import radical_translations.utils.signals  # noqa F401
@@ -1,6 +1,88 @@
-from typing import Dict, Optional
+import hashlib
+import json
+import time
+import uuid
+from typing import Dict, Optional, Set, Tuple
 
-from django_elasticsearch_dsl import fields
+from django.core.cache import cache
+from django_elasticsearch_dsl import Document, fields
+from geonames_place.models import Country
+
+# cache key of the current version of the countries, changed when a country changes,
+# so that every process reloads them
+COUNTRIES_VERSION_KEY = "countries-version"
+# seconds the loaded countries are used before their version is checked again
+COUNTRIES_VERSION_TIMEOUT = 10
+
+# version, country names by id and the set of country names, loaded once per process
+# and per version of the countries
+_countries: Optional[Tuple[str, Dict[int, str], Set[str]]] = None
+# when the version of the loaded countries was last checked
+_countries_checked = 0.0
+
+
+def load_countries() -> Tuple[Dict[int, str], Set[str]]:
+    global _countries, _countries_checked
+
+    now = time.monotonic()
+    if _countries is not None and now - _countries_checked < COUNTRIES_VERSION_TIMEOUT:
+        return _countries[1], _countries[2]
+
+    version = cache.get_or_set(COUNTRIES_VERSION_KEY, uuid.uuid4().hex, None)
+    _countries_checked = now
+
+    if _countries is None or _countries[0] != version:
+        names = dict(Country.objects.values_list("id", "name"))
+        _countries = (version, names, set(names.values()))
+
+    return _countries[1], _countries[2]
+
+
+def get_countries() -> Dict[int, str]:
+    """Returns the names of all the countries keyed by id."""
+    return load_countries()[0]
+
+
+def get_country_name(country_id: Optional[int]) -> Optional[str]:
+    return get_countries().get(country_id)
+
+
+def is_country_name(name: str) -> bool:
+    return name in load_countries()[1]
+
+
+def clear_countries():
+    """Discards the countries loaded by all the processes."""
+    global _countries
+
+    cache.set(COUNTRIES_VERSION_KEY, uuid.uuid4().hex, None)
+    _countries = None
+
+
+def get_content_hash(data: Dict) -> str:
+    """Returns a stable hash of the prepared document `data`, not including the
+    hash itself."""
+    content = json.dumps(
+        {key: value for key, value in data.items() if key != "content_hash"},
+        default=str,
+        separators=(",", ":"),
+        sort_keys=True,
+    )
+
+    return hashlib.sha1(content.encode()).hexdigest()
+
+
+class HashedDocument(Document):
+    """Document that stores the hash of its content, so that an object can be
+    skipped when it is indexed again and its prepared document has not changed."""
+
+    content_hash = fields.KeywordField(index=False, doc_values=False)
+
+    def prepare(self, instance):
+        data = super().prepare(instance)
+        data["content_hash"] = get_content_hash(data)
+
+        return data
 
 
 def get_agent_field(options: Optional[Dict] = {}) -> fields.ObjectField:
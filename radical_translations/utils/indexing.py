@@ -0,0 +1,473 @@
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import connections as db_connections
+from django.db import models, transaction
+from django.db.models.query import QuerySet
+from django_elasticsearch_dsl import Document
+from django_elasticsearch_dsl.apps import DEDConfig
+from django_elasticsearch_dsl.registries import registry
+from django_elasticsearch_dsl.signals import RealTimeSignalProcessor
+from elasticsearch_dsl import Index
+from elasticsearch_dsl.connections import connections
+
+from radical_translations.utils.models import IndexQueueItem
+from radical_translations.utils.profiling import PrepareProfiler, Stats
+from radical_translations.utils.search import invalidate_facets
+
+logger = logging.getLogger(__name__)
+
+# documents instances of the current process, reused across the ranges so that the
+# per document caches, such as the resources graph, are only preloaded once
+_documents: Dict[str, Document] = {}
+# profiler of the documents of the current process, when profiling
+_profiler: Optional[PrepareProfiler] = None
+
+
+def get_document_classes(names: Optional[List[str]] = None) -> Dict[str, type]:
+    """Returns the registered document classes keyed by index name, limited to the
+    indices in `names` when given."""
+    documents = {
+        document._index._name: document
+        for document in sorted(registry.get_documents(), key=lambda d: d._index._name)
+    }
+
+    if names:
+        return {name: documents[name] for name in names}
+
+    return documents
+
+
+def get_document(name: str) -> Document:
+    if name not in _documents:
+        _documents[name] = get_document_classes([name])[name]()
+
+        if hasattr(_documents[name], "preload"):
+            _documents[name].preload()
+
+        if _profiler:
+            _profiler.instrument(_documents[name])
+
+    return _documents[name]
+
+
+def get_id_ranges(queryset: QuerySet, chunk_size: int) -> List[Tuple[int, int]]:
+    """Splits the `queryset` into ranges of at most `chunk_size` consecutive ids,
+    returned as `(first_id, last_id)` tuples."""
+    ids = list(queryset.order_by("pk").values_list("pk", flat=True).distinct())
+
+    return [
+        (ids[i], ids[min(i + chunk_size, len(ids)) - 1])
+        for i in range(0, len(ids), chunk_size)
+    ]
+
+
+def init_worker(profile: bool = False):
+    """Initialises an indexing worker process with its own Elasticsearch connection.
+    The database connections are closed before the workers are started, so each
+    worker opens its own. With `profile`, the preparation of the documents is
+    measured."""
+    global _profiler
+
+    _documents.clear()
+    _profiler = PrepareProfiler() if profile else None
+
+    for alias, options in settings.ELASTICSEARCH_DSL.items():
+        connections.create_connection(alias=alias, **options)
+
+
+def index_range(
+    name: str, index: str, first_id: int, last_id: int
+) -> Tuple[int, Stats]:
+    """Indexes, into the concrete `index`, the objects of the `name` index with ids
+    between `first_id` and `last_id`. Returns the number of objects indexed, and the
+    preparation stats when profiling."""
+    document = get_document(name)
+    # writes into the given version instead of the version the alias points to
+    document._index = type(document)._index.clone(index)
+
+    objects = list(document.get_queryset().filter(pk__gte=first_id, pk__lte=last_id))
+
+    if hasattr(document, "prefetch_related"):
+        objects = document.prefetch_related(objects)
+
+    if not _profiler:
+        document.update(objects, parallel=True, refresh=False)
+        return len(objects), {}
+
+    # the parallel bulk prepares the documents in another thread, where the queries
+    # would not be counted
+    with _profiler.record():
+        document.update(objects, refresh=False)
+
+    return len(objects), _profiler.pop_stats()
+
+
+def create_index_version(document_class: type, version: str) -> Index:
+    """Creates a new version of the index of the `document_class`, named after the
+    index alias and the `version`, with no replicas and no refreshes, so that it
+    can be loaded quickly while the alias keeps serving the current version."""
+    index = document_class._index.clone(f"{document_class._index._name}-{version}")
+    index.settings(number_of_replicas=0, refresh_interval="-1")
+    index.create()
+
+    return index
+
+
+def get_index_versions(document_class: type) -> List[str]:
+    """Returns the names of the versions of the index of the `document_class`, oldest
+    first."""
+    es = connections.get_connection()
+    name = document_class._index._name
+
+    return sorted(es.indices.get(index=f"{name}-*", expand_wildcards="open").keys())
+
+
+def publish_index_version(
+    document_class: type, index: Index, keep: int = 1
+) -> List[str]:
+    """Restores the settings of the loaded `index`, atomically points the alias of
+    the `document_class` to it and deletes the previous versions, except for the
+    `keep` most recent ones. Returns the names of the deleted versions. If the
+    alias cannot be moved, the `index` is deleted."""
+    es = connections.get_connection()
+    alias = document_class._index._name
+    settings = document_class._index.to_dict().get("settings", {})
+
+    try:
+        index.put_settings(
+            body={
+                "index": {
+                    "number_of_replicas": settings.get("number_of_replicas"),
+                    "refresh_interval": settings.get("refresh_interval"),
+                }
+            }
+        )
+        index.refresh()
+
+        actions = [{"add": {"index": index._name, "alias": alias}}]
+        if es.indices.exists_alias(name=alias):
+            actions.insert(0, {"remove": {"index": f"{alias}-*", "alias": alias}})
+        elif es.indices.exists(index=alias):
+            # the index was created before it was versioned, it is replaced by the
+            # alias
+            actions.insert(0, {"remove_index": {"index": alias}})
+
+        es.indices.update_aliases(body={"actions": actions})
+    except Exception:
+        index.delete(ignore=404)
+        raise
+
+    invalidate_facets()
+
+    previous = [
+        name for name in get_index_versions(document_class) if name != index._name
+    ]
+    pruned = previous[:-keep] if keep else previous
+
+    for name in pruned:
+        es.indices.delete(index=name)
+
+    return pruned
+
+
+def get_stale_ids(document: Document) -> Set[int]:
+    """Returns the ids of the documents in the index whose objects are no longer in
+    the document queryset, because they were deleted or stopped being indexed."""
+    indexed = {int(hit.meta.id) for hit in document.search().source(False).scan()}
+
+    return indexed - set(document.get_queryset().values_list("pk", flat=True))
+
+
+# (document class, action) -> object ids
+Pending = Dict[Tuple[type, str], Set[int]]
+
+
+def index_changed(document: Document, objects: List[models.Model]) -> Tuple[int, int]:
+    """Indexes the `objects` whose prepared documents have a different content hash
+    than the indexed ones. Returns the number of objects indexed and skipped."""
+    actions = [
+        document._prepare_action(obj, "index")
+        for obj in objects
+        if document.should_index_object(obj)
+    ]
+    if not actions:
+        return 0, 0
+
+    response = document._get_connection().mget(
+        body={"ids": [action["_id"] for action in actions]},
+        index=document._index._name,
+        _source_includes=["content_hash"],
+    )
+    hashes = {
+        doc["_id"]: doc["_source"].get("content_hash")
+        for doc in response["docs"]
+        if doc.get("found")
+    }
+
+    changed = [
+        action
+        for action in actions
+        if hashes.get(str(action["_id"])) != action["_source"].get("content_hash")
+    ]
+    if changed:
+        # refreshes as `update` does, so that the changes are searchable straight
+        # away
+        document.bulk(changed, refresh=document.django.auto_refresh)
+
+    return len(changed), len(actions) - len(changed)
+
+
+def index_pending(
+    pending: Pending,
+    skip_unchanged: bool = False,
+    profiler: Optional[PrepareProfiler] = None,
+    documents: Optional[Dict[type, Document]] = None,
+) -> Tuple[int, int]:
+    """Indexes, or deletes from the index, the objects in `pending`, with one bulk
+    request per document and action. With `skip_unchanged`, the objects whose
+    documents have not changed are not sent. With a `profiler`, the preparation of
+    the documents is measured. The `documents` instances, by document class, are
+    used instead of new ones, to reuse their caches. Returns the number of objects
+    indexed and skipped."""
+    indexed = skipped = deleted = 0
+
+    for (document_class, action), ids in pending.items():
+        if not ids:
+            continue
+
+        model = document_class.django.model
+        document = documents.get(document_class) if documents else None
+
+        if document is None:
+            document = document_class()
+
+            if profiler:
+                profiler.instrument(document)
+
+        if action == "delete":
+            document.update(
+                [model(pk=pk) for pk in ids], action="delete", raise_on_error=False
+            )
+            deleted += len(ids)
+            continue
+
+        objects = list(model._default_manager.filter(pk__in=ids))
+        if not objects:
+            continue
+
+        if hasattr(document, "prefetch_related"):
+            objects = document.prefetch_related(objects)
+
+        if skip_unchanged:
+            counts = index_changed(document, objects)
+            indexed += counts[0]
+            skipped += counts[1]
+        else:
+            document.update(objects)
+            indexed += len(objects)
+
+    if indexed or deleted:
+        invalidate_facets()
+
+    return indexed, skipped
+
+
+def index_queued(batch_size: int = 500) -> int:
+    """Indexes a batch of the objects in the index queue, and removes them from the
+    queue. Returns the number of objects taken from the queue."""
+    documents = get_document_classes()
+
+    with transaction.atomic():
+        # concurrent runs take different batches
+        items = list(
+            IndexQueueItem.objects.select_for_update(skip_locked=True)[:batch_size]
+        )
+
+        pending = defaultdict(set)
+        for item in items:
+            if item.index in documents:
+                pending[(documents[item.index], "index")].add(item.object_id)
+
+        index_pending(pending, skip_unchanged=True)
+
+        IndexQueueItem.objects.filter(pk__in=[item.pk for item in items]).delete()
+
+    return len(items)
+
+
+def index_pending_in_background(pending: Pending):
+    try:
+        index_pending(pending)
+
+        while index_queued():
+            pass
+    except Exception:
+        # the future of the task is never read, the errors would be lost
+        logger.exception("Failed to index the pending objects in the background")
+    finally:
+        db_connections.close_all()
+
+
+class TransactionSignalProcessor(RealTimeSignalProcessor):
+    """Signal processor that, instead of updating the index on every signal, queues
+    the objects to update, coalescing duplicates, and indexes them in bulk when the
+    transaction is committed, or straight away when `ELASTICSEARCH_DSL_ON_COMMIT` is
+    False. With `ELASTICSEARCH_DSL_BACKGROUND` the objects are indexed in a
+    background thread.
+
+    When a change to a related object, such as a controlled term, affects more than
+    `ELASTICSEARCH_DSL_FAN_OUT_LIMIT` objects, they are added to the index queue
+    instead, to be indexed in batches by the `process_index_queue` command, or by
+    the background thread."""
+
+    executor = None
+
+    def __init__(self, connections):
+        self.local = threading.local()
+        super().__init__(connections)
+
+    def get_pending(self) -> Pending:
+        batch = self.get_batch()
+        if batch is not None:
+            return batch
+
+        if not hasattr(self.local, "pending"):
+            self.local.pending = defaultdict(set)
+
+        return self.local.pending
+
+    def get_batch(self) -> Optional[Pending]:
+        """Returns the objects to index when the current transaction, or savepoint, is
+        committed, or None when they are indexed straight away. Each transaction and
+        savepoint has its own batch, flushed by its own commit hook; when it is
+        rolled back Django drops the hook, and the batch is discarded with it, so
+        that its objects are not indexed by the next transaction of the thread."""
+        if not getattr(settings, "ELASTICSEARCH_DSL_ON_COMMIT", True):
+            return None
+
+        connection = transaction.get_connection()
+        if not connection.in_atomic_block:
+            return None
+
+        if not hasattr(self.local, "batches"):
+            self.local.batches = {}
+
+        hooks = [hook[1] for hook in connection.run_on_commit]
+        # the batches of the rolled back transactions and savepoints
+        for key, (_, commit) in list(self.local.batches.items()):
+            if commit not in hooks:
+                del self.local.batches[key]
+
+        key = tuple(connection.savepoint_ids)
+        if key not in self.local.batches:
+            batch = defaultdict(set)
+
+            def commit():
+                self.local.batches.pop(key, None)
+                self.flush(batch)
+
+            self.local.batches[key] = (batch, commit)
+            transaction.on_commit(commit)
+
+        return self.local.batches[key][0]
+
+    def handle_save(self, sender, instance, **kwargs):
+        self.queue_related(instance)
+        self.queue(instance, "index")
+
+    def handle_pre_delete(self, sender, instance, **kwargs):
+        # the related objects are only known before the delete, they are indexed
+        # after the commit, without the deleted instance
+        self.queue_related(instance)
+
+    def handle_delete(self, sender, instance, **kwargs):
+        self.queue(instance, "delete")
+
+    def queue(self, instance: models.Model, action: str):
+        if not DEDConfig.autosync_enabled():
+            return
+
+        for document in registry._models.get(instance.__class__, []):
+            if not document.django.ignore_signals:
+                self.add(document, action, [instance.pk])
+
+    def queue_related(self, instance: models.Model):
+        if not DEDConfig.autosync_enabled():
+            return
+
+        for document in registry._get_related_doc(instance):
+            try:
+                related = document().get_instances_from_related(instance)
+            except ObjectDoesNotExist:
+                related = None
+
+            if related is None:
+                continue
+
+            if isinstance(related, models.Model):
+                ids = [related.pk]
+            elif isinstance(related, QuerySet):
+                ids = related.values_list("pk", flat=True)
+            else:
+                ids = [obj.pk for obj in related]
+
+            ids = set(ids)
+            if len(ids) > getattr(settings, "ELASTICSEARCH_DSL_FAN_OUT_LIMIT", 100):
+                self.defer(document, ids)
+            else:
+                self.add(document, "index", ids)
+
+    def defer(self, document: type, ids: Set[int]):
+        """Adds the objects to the index queue, except for the ones already pending,
+        which are indexed with the transaction."""
+        ids = ids - self.get_pending()[(document, "index")]
+
+        IndexQueueItem.objects.bulk_create(
+            [
+                IndexQueueItem(index=document._index._name, object_id=pk)
+                for pk in ids
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+    def add(self, document: type, action: str, ids: Iterable[int]):
+        pending = self.get_pending()
+        ids = set(ids)
+
+        if action == "delete":
+            pending[(document, "index")] -= ids
+
+        pending[(document, action)].update(ids)
+
+        if self.get_batch() is None:
+            self.flush()
+
+    def flush(self, pending: Optional[Pending] = None):
+        """Indexes the `pending` objects, by default the ones pending with the current
+        transaction, and empties them."""
+        if pending is None:
+            pending = self.get_pending()
+
+        if not pending:
+            return
+
+        # the objects queued while indexing go into the emptied batch
+        batch = dict(pending)
+        pending.clear()
+
+        if getattr(settings, "ELASTICSEARCH_DSL_BACKGROUND", False):
+            if TransactionSignalProcessor.executor is None:
+                TransactionSignalProcessor.executor = ThreadPoolExecutor(max_workers=1)
+
+            TransactionSignalProcessor.executor.submit(
+                index_pending_in_background, batch
+            )
+        else:
+            index_pending(batch)
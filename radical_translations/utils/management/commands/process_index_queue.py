@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from radical_translations.utils.indexing import index_queued
+from radical_translations.utils.models import IndexQueueItem
+
+
+class Command(BaseCommand):
+    help = (
+        "Indexes, in batches, the objects in the index queue, queued when a change "
+        "to a shared object affects too many documents to update them on save."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of objects indexed in each batch.",
+        )
+
+    def handle(self, *args, **options):
+        total = IndexQueueItem.objects.count()
+        done = 0
+
+        while True:
+            count = index_queued(options["batch_size"])
+            if not count:
+                break
+
+            done += count
+            self.stdout.write(f"Indexed {done} of {total} queued objects")
+
+        self.stdout.write(self.style.SUCCESS(f"done, {done} objects indexed"))
@@ -0,0 +1,156 @@
+import os
+import time
+from multiprocessing import Pool
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.utils import timezone
+
+from radical_translations.utils.indexing import (
+    create_index_version,
+    get_document_classes,
+    get_id_ranges,
+    index_range,
+    init_worker,
+    publish_index_version,
+)
+from radical_translations.utils.models import IndexWatermark
+from radical_translations.utils.profiling import PrepareProfiler
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the search indices, preparing the documents in a pool of worker "
+        "processes, each indexing ranges of object ids. Each index is rebuilt into a "
+        "new version, the index alias is moved to it once it is loaded, so that the "
+        "current version keeps being searched during the rebuild."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--index",
+            action="append",
+            dest="indices",
+            choices=list(get_document_classes().keys()),
+            help="Index to rebuild, can be repeated. Defaults to all the indices.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Number of worker processes. Defaults to the number of CPUs.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of objects in each range of ids indexed by a worker.",
+        )
+        parser.add_argument(
+            "--profile",
+            action="store_true",
+            help=(
+                "Measure the time, calls and SQL queries of the preparation of each "
+                "document field, and report them."
+            ),
+        )
+        parser.add_argument(
+            "--profile-json",
+            metavar="PATH",
+            help="Also write the profile report as JSON to the given path.",
+        )
+        parser.add_argument(
+            "--keep",
+            type=int,
+            default=1,
+            help="Number of previous versions of each index to keep.",
+        )
+
+    def handle(self, *args, **options):
+        documents = get_document_classes(options["indices"])
+        chunk_size = options["chunk_size"]
+        # objects modified while rebuilding are picked up by `update_indices --since`
+        watermark = timezone.now()
+        version = watermark.strftime("%Y%m%d%H%M%S")
+
+        profile = options["profile"] or bool(options["profile_json"])
+        profiler = PrepareProfiler()
+
+        # the versions not published yet, deleted if the rebuild fails
+        indices = {}
+        report = []
+
+        try:
+            tasks = {}
+            for name, document in documents.items():
+                indices[name] = create_index_version(document, version)
+                self.stdout.write(f"Created index {indices[name]._name}")
+
+                tasks[name] = [
+                    (name, indices[name]._name, first_id, last_id)
+                    for first_id, last_id in get_id_ranges(
+                        document().get_queryset(), chunk_size
+                    )
+                ]
+
+            # the workers are forked, they need to open their own database connections
+            connections.close_all()
+
+            with Pool(
+                options["workers"], initializer=init_worker, initargs=(profile,)
+            ) as pool:
+                for name, document in documents.items():
+                    index = indices[name]
+
+                    self.stdout.write(
+                        f"Indexing {name} in {len(tasks[name])} ranges ...",
+                        ending=" ",
+                    )
+                    start = time.perf_counter()
+
+                    count = 0
+                    for range_count, stats in pool.starmap(index_range, tasks[name]):
+                        count += range_count
+                        profiler.merge(stats)
+                    index.refresh()
+
+                    elapsed = time.perf_counter() - start
+                    report.append((name, count, elapsed))
+                    self.stdout.write(self.style.SUCCESS(f"done, {count} documents"))
+
+                    indexed = index.search().count()
+                    if indexed != count:
+                        del indices[name]
+                        index.delete()
+                        self.stderr.write(
+                            f"{index._name} has {indexed} documents, expected "
+                            f"{count}, {name} was not updated"
+                        )
+                        continue
+
+                    self.stdout.write(f"Moving {name} to {index._name} ...", ending=" ")
+                    # deletes the version itself if it cannot be published
+                    del indices[name]
+                    pruned = publish_index_version(document, index, options["keep"])
+                    IndexWatermark.set_watermark(name, watermark)
+                    self.stdout.write(
+                        self.style.SUCCESS(f"done, {len(pruned)} old versions deleted")
+                    )
+        except BaseException:
+            for index in indices.values():
+                index.delete(ignore=404)
+            raise
+
+        for name, count, elapsed in report:
+            throughput = count / elapsed if elapsed else 0
+            self.stdout.write(
+                f"{name}: {count} documents in {elapsed:.1f}s "
+                f"({throughput:.1f} documents/s)"
+            )
+
+        if profile:
+            for line in profiler.format_report():
+                self.stdout.write(line)
+
+        if options["profile_json"]:
+            profiler.write_json(options["profile_json"])
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from radical_translations.utils.models import Date
+
+
+class Command(BaseCommand):
+    help = (
+        "Parses the `Date` display values and stores the earliest and latest dates "
+        "and years."
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Refreshing date bounds ...", ending=" ")
+        updated = Date.refresh_all_bounds()
+        self.stdout.write(self.style.SUCCESS(f"done, {updated} dates updated"))
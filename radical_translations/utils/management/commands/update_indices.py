@@ -0,0 +1,162 @@
+from contextlib import nullcontext
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from radical_translations.utils.indexing import (
+    get_document_classes,
+    get_stale_ids,
+    index_pending,
+)
+from radical_translations.utils.models import IndexWatermark
+from radical_translations.utils.profiling import PrepareProfiler
+from radical_translations.utils.search import invalidate_facets
+
+
+class Command(BaseCommand):
+    help = (
+        "Updates the search indices in place, indexing the objects modified since the "
+        "last update, or all the objects, and deleting the documents whose objects "
+        "were deleted. Documents that have not changed are not sent again. Stores "
+        "the time of the update as the index watermark."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--index",
+            action="append",
+            dest="indices",
+            choices=list(get_document_classes().keys()),
+            help="Index to update, can be repeated. Defaults to all the indices.",
+        )
+        parser.add_argument(
+            "--since",
+            nargs="?",
+            const="",
+            help=(
+                "Only index the objects modified since the given date or date time. "
+                "Without a value, since the index watermark."
+            ),
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Index all the objects, even the ones whose documents are unchanged.",
+        )
+        parser.add_argument(
+            "--profile",
+            action="store_true",
+            help=(
+                "Measure the time, calls and SQL queries of the preparation of each "
+                "document field, and report them."
+            ),
+        )
+        parser.add_argument(
+            "--profile-json",
+            metavar="PATH",
+            help="Also write the profile report as JSON to the given path.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of objects indexed in each bulk request.",
+        )
+
+    def handle(self, *args, **options):
+        documents = get_document_classes(options["indices"])
+
+        profile = options["profile"] or bool(options["profile_json"])
+        profiler = PrepareProfiler() if profile else None
+
+        with profiler.record() if profiler else nullcontext():
+            self.update(documents, profiler, options)
+
+        if profiler:
+            for line in profiler.format_report():
+                self.stdout.write(line)
+
+        if options["profile_json"]:
+            profiler.write_json(options["profile_json"])
+
+    def update(self, documents, profiler, options):
+        chunk_size = options["chunk_size"]
+
+        for name, document_class in documents.items():
+            since = self.get_since(name, options["since"])
+            document = document_class()
+            # changes made while indexing are picked up by the next update
+            start = timezone.now()
+
+            if since:
+                self.stdout.write(f"Updating {name} since {since} ...", ending=" ")
+                queryset = document.get_modified_queryset(since)
+            else:
+                self.stdout.write(f"Updating {name} ...", ending=" ")
+                queryset = document.get_queryset()
+
+                # every object is indexed, the caches are loaded for all of them once
+                if hasattr(document, "preload"):
+                    document.preload()
+
+            if profiler:
+                profiler.instrument(document)
+
+            indexed = skipped = 0
+
+            ids = sorted(set(queryset.values_list("pk", flat=True)))
+            for start_index in range(0, len(ids), chunk_size):
+                end_index = start_index + chunk_size
+                chunk = set(ids[start_index:end_index])
+                counts = index_pending(
+                    {(document_class, "index"): chunk},
+                    skip_unchanged=not options["force"],
+                    profiler=profiler,
+                    documents={document_class: document},
+                )
+                indexed += counts[0]
+                skipped += counts[1]
+
+            stale_ids = get_stale_ids(document)
+            index_pending({(document_class, "delete"): stale_ids})
+
+            document._index.refresh()
+            # the facets cached before the refresh may be out of date
+            invalidate_facets()
+            IndexWatermark.set_watermark(name, start)
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"done, {indexed} indexed, {skipped} unchanged, "
+                    f"{len(stale_ids)} deleted"
+                )
+            )
+
+    def get_since(self, name, since):
+        if since is None:
+            return None
+
+        if not since:
+            watermark = IndexWatermark.get_watermark(name)
+            if not watermark:
+                raise CommandError(
+                    f"The index {name} has no watermark, update it without --since "
+                    "or give a date."
+                )
+
+            return watermark
+
+        value = parse_datetime(since)
+        if not value:
+            day = parse_date(since)
+            if not day:
+                raise CommandError(f"Invalid date: {since}")
+
+            value = datetime(day.year, day.month, day.day)
+
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+
+        return value
@@ -0,0 +1,33 @@
+# Generated by Django 2.2.28 on 2026-10-18 11:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utils', '0008_merge_french_languages'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='date',
+            name='date_lower',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='date',
+            name='date_upper',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='date',
+            name='year_earliest',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='date',
+            name='year_latest',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 2.2.28 on 2026-10-18 11:12
+
+from datetime import date
+from time import mktime
+
+from django.db import migrations
+from edtf import parse_edtf
+from edtf.parser.edtf_exceptions import EDTFParseException
+
+
+def load_date_bounds(apps, _):
+    Date = apps.get_model("utils", "Date")
+
+    dates = list(Date.objects.all())
+
+    for d in dates:
+        try:
+            struct = parse_edtf(d.date_display)
+        except (AttributeError, EDTFParseException):
+            struct = None
+
+        if struct:
+            d.date_lower = date.fromtimestamp(mktime(struct.lower_strict()))
+            d.date_upper = date.fromtimestamp(mktime(struct.upper_strict()))
+            d.year_earliest = d.date_lower.year
+            d.year_latest = d.date_upper.year
+
+    Date.objects.bulk_update(
+        dates,
+        ["date_lower", "date_upper", "year_earliest", "year_latest"],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("utils", "0009_date_bounds"),
+    ]
+
+    operations = [migrations.RunPython(load_date_bounds, migrations.RunPython.noop)]
@@ -0,0 +1,24 @@
+# Generated by Django 2.2.28 on 2026-10-18 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utils', '0010_load_date_bounds'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndexWatermark',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.CharField(max_length=64, unique=True)),
+                ('watermark', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['index'],
+            },
+        ),
+    ]
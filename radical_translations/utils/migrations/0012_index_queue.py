@@ -0,0 +1,26 @@
+# Generated by Django 2.2.28 on 2026-10-18 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utils', '0011_index_watermark'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndexQueueItem',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.CharField(max_length=64)),
+                ('object_id', models.PositiveIntegerField()),
+                ('created', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['id'],
+                'unique_together': {('index', 'object_id')},
+            },
+        ),
+    ]
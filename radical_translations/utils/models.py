@@ -1,5 +1,5 @@
 import re
-from datetime import date
+from datetime import date, datetime
 from time import mktime, struct_time
 from typing import Dict, Optional
 
@@ -50,6 +50,17 @@ class Date(TimeStampedModel):
     date_sort_ascending = models.FloatField(blank=True, null=True)
     date_sort_descending = models.FloatField(blank=True, null=True)
 
+    # parsed bounds, computed on save so that indexing does not have to parse the
+    # edtf date again
+    date_lower = models.DateField(blank=True, null=True, editable=False)
+    date_upper = models.DateField(blank=True, null=True, editable=False)
+    year_earliest = models.IntegerField(
+        blank=True, null=True, editable=False, db_index=True
+    )
+    year_latest = models.IntegerField(
+        blank=True, null=True, editable=False, db_index=True
+    )
+
     date_radical = models.CharField(
         max_length=255, blank=True, null=True, help_text="Alternative calendar date."
     )
@@ -72,7 +83,48 @@ class Date(TimeStampedModel):
     def is_radical(self) -> bool:
         return self.date_radical is not None
 
+    def save(self, *args, **kwargs):
+        self.refresh_bounds()
+        super().save(*args, **kwargs)
+
+    def refresh_bounds(self):
+        """Parses the `date_display` and sets the stored date and year bounds."""
+        struct = self.parse_date()
+        if not struct:
+            self.date_lower = None
+            self.date_upper = None
+        else:
+            self.date_lower = date.fromtimestamp(mktime(struct.lower_strict()))
+            self.date_upper = date.fromtimestamp(mktime(struct.upper_strict()))
+
+        self.year_earliest = self.date_lower.year if self.date_lower else None
+        self.year_latest = self.date_upper.year if self.date_upper else None
+
+    @staticmethod
+    def refresh_all_bounds(queryset: Optional[models.QuerySet] = None) -> int:
+        """Recomputes and stores the date and year bounds for all the dates in the
+        `queryset`. Returns the number of dates updated."""
+        if queryset is None:
+            queryset = Date.objects.all()
+
+        fields = ["date_lower", "date_upper", "year_earliest", "year_latest"]
+
+        dates = []
+        for d in queryset.only("id", "date_display", *fields):
+            bounds = [getattr(d, field) for field in fields]
+            d.refresh_bounds()
+
+            if bounds != [getattr(d, field) for field in fields]:
+                dates.append(d)
+
+        Date.objects.bulk_update(dates, fields, batch_size=500)
+
+        return len(dates)
+
     def get_date_earliest(self) -> Optional[date]:
+        if self.date_lower:
+            return self.date_lower
+
         struct = self.parse_date()
         if not struct:
             return None
@@ -86,6 +138,9 @@ class Date(TimeStampedModel):
             return None
 
     def get_date_latest(self) -> Optional[date]:
+        if self.date_upper:
+            return self.date_upper
+
         struct = self.parse_date()
         if not struct:
             return None
@@ -129,6 +184,51 @@ def date_to_dict(date: Date, label: Optional[str] = "date") -> Dict:
     }
 
 
+class IndexWatermark(models.Model):
+    """High-water mark of a search index: the time of the last update of the index,
+    objects modified after it have not been indexed yet."""
+
+    index = models.CharField(max_length=64, unique=True)
+    watermark = models.DateTimeField()
+
+    class Meta:
+        ordering = ["index"]
+
+    def __str__(self) -> str:
+        return f"{self.index}: {self.watermark}"
+
+    @staticmethod
+    def get_watermark(index: str) -> Optional[datetime]:
+        mark = IndexWatermark.objects.filter(index=index).first()
+        if not mark:
+            return None
+
+        return mark.watermark
+
+    @staticmethod
+    def set_watermark(index: str, watermark: datetime):
+        IndexWatermark.objects.update_or_create(
+            index=index, defaults={"watermark": watermark}
+        )
+
+
+class IndexQueueItem(models.Model):
+    """Object waiting to be indexed outside of a request, queued when a change to a
+    shared object, such as a controlled term, affects too many documents to update
+    them when the change is saved."""
+
+    index = models.CharField(max_length=64)
+    object_id = models.PositiveIntegerField()
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+        unique_together = ["index", "object_id"]
+
+    def __str__(self) -> str:
+        return f"{self.index}: {self.object_id}"
+
+
 class EditorialClassificationModel(models.Model):
     classification = ControlledTermsField(
         ["wikidata"],
@@ -0,0 +1,111 @@
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple
+
+from django.db import connection
+from django_elasticsearch_dsl import Document
+
+# name under which the whole preparation of the documents is recorded
+TOTAL = "(total)"
+
+# (document class name, field name) -> [calls, seconds, queries]
+Stats = Dict[Tuple[str, str], List]
+
+
+class PrepareProfiler:
+    """Records the wall time, number of calls and number of SQL queries of the
+    prepare functions of each field of the instrumented documents, and of the
+    preparation of the whole documents."""
+
+    def __init__(self):
+        self.stats: Stats = defaultdict(lambda: [0, 0.0, 0])
+        self.queries = 0
+
+    def count_query(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def record(self):
+        """Counts the SQL queries run in the context."""
+        with connection.execute_wrapper(self.count_query):
+            yield self
+
+    def measure(self, document: str, field: str, fn: Callable) -> Callable:
+        def measured(instance):
+            start = time.perf_counter()
+            queries = self.queries
+
+            try:
+                return fn(instance)
+            finally:
+                stat = self.stats[(document, field)]
+                stat[0] += 1
+                stat[1] += time.perf_counter() - start
+                stat[2] += self.queries - queries
+
+        return measured
+
+    def instrument(self, document: Document) -> Document:
+        """Wraps the prepare functions of the `document` fields, and the document
+        `prepare` method, to measure them."""
+        name = type(document).__name__
+
+        document._prepared_fields = [
+            (field_name, field, self.measure(name, field_name, fn))
+            for field_name, field, fn in document._prepared_fields
+        ]
+        document.prepare = self.measure(name, TOTAL, document.prepare)
+
+        return document
+
+    def pop_stats(self) -> Stats:
+        """Returns the stats recorded so far, as a plain dictionary that can be sent
+        across processes, and resets them."""
+        stats = dict(self.stats)
+        self.stats.clear()
+
+        return stats
+
+    def merge(self, stats: Stats):
+        for key, (calls, seconds, queries) in stats.items():
+            stat = self.stats[key]
+            stat[0] += calls
+            stat[1] += seconds
+            stat[2] += queries
+
+    def get_report(self) -> List[Dict]:
+        """Returns the stats of each document field, slowest first."""
+        report = [
+            {
+                "document": document,
+                "field": field,
+                "calls": calls,
+                "seconds": seconds,
+                "queries": queries,
+            }
+            for (document, field), (calls, seconds, queries) in self.stats.items()
+        ]
+
+        return sorted(report, key=lambda row: row["seconds"], reverse=True)
+
+    def format_report(self) -> List[str]:
+        lines = [
+            f"{'document':<20} {'field':<28} {'calls':>8} {'seconds':>10} "
+            f"{'ms/call':>8} {'queries':>8}"
+        ]
+
+        for row in self.get_report():
+            per_call = row["seconds"] * 1000 / row["calls"] if row["calls"] else 0
+            lines.append(
+                f"{row['document']:<20} {row['field']:<28} {row['calls']:>8} "
+                f"{row['seconds']:>10.3f} {per_call:>8.3f} {row['queries']:>8}"
+            )
+
+        return lines
+
+    def write_json(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.get_report(), f, indent=2)
@@ -1,15 +1,184 @@
+import base64
+import binascii
+import hashlib
+import json
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django_elasticsearch_dsl_drf.filter_backends import FacetedSearchFilterBackend
 from django_elasticsearch_dsl_drf.pagination import (
     PageNumberPagination as BasePageNumberPagination,
 )
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# cache key of the current version of the facets, changed when the indices change
+FACETS_VERSION_KEY = "search-facets-version"
+# query parameters that don't change the facets
+FACETS_IGNORED_PARAMS = ["cursor", "fields", "ordering", "page", "page_size"]
+
+
+def get_facets_version() -> str:
+    return cache.get_or_set(FACETS_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def invalidate_facets():
+    """Discards all the cached facets, to be called after writing to the indices."""
+    cache.set(FACETS_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def get_facets_cache_key(request, view) -> str:
+    """Returns the cache key of the facets of a search, from its filter and search
+    parameters, and whether the private documents are included."""
+    params = sorted(
+        (name, sorted(values))
+        for name, values in request.query_params.lists()
+        if name not in FACETS_IGNORED_PARAMS
+    )
+    digest = hashlib.sha1(json.dumps(params).encode()).hexdigest()
+    audience = "authenticated" if request.user.is_authenticated else "anonymous"
+
+    return (
+        f"search-facets:{get_facets_version()}:{view.document._index._name}:"
+        f"{type(view).__name__}:{audience}:{digest}"
+    )
+
+
+class CachedFacetedSearchFilterBackend(FacetedSearchFilterBackend):
+    """Faceted search backend that only computes the facets requested with the
+    `facets` query parameter, which can be `none`, the default, `all`, for the
+    enabled facets, or a list of facet names, repeated or comma separated.
+
+    The facets aggregations are only added to the search when the facets for the
+    same filters are not cached. The facets are read from, and stored in, the cache
+    by the `PageNumberPagination`."""
+
+    facets_query_param = "facets"
+
+    def get_requested_facets(self, request, view) -> List[str]:
+        fields = self.prepare_faceted_search_fields(view)
+        names = [
+            name
+            for value in request.query_params.getlist(self.facets_query_param)
+            for name in value.split(",")
+            if name
+        ]
+
+        if not names or "none" in names:
+            return []
+
+        if "all" in names:
+            return [name for name, options in fields.items() if options["enabled"]]
+
+        return [name for name in fields if name in names]
+
+    def construct_facets(self, request, view) -> Dict[str, Dict]:
+        fields = self.prepare_faceted_search_fields(view)
+
+        return {
+            name: {
+                "facet": fields[name]["facet"](
+                    field=fields[name]["field"], **fields[name]["options"]
+                ),
+                "global": fields[name]["global"],
+            }
+            for name in self.get_requested_facets(request, view)
+        }
+
+    def filter_queryset(self, request, queryset, view):
+        if not self.get_requested_facets(request, view):
+            return queryset
+
+        key = get_facets_cache_key(request, view)
+
+        facets = cache.get(key)
+        if facets is not None:
+            view.cached_facets = facets
+            return queryset
+
+        view.facets_cache_key = key
+
+        return super().filter_queryset(request, queryset, view)
+
+
+class SourceFieldsFilterBackend(BaseFilterBackend):
+    """Limits the document fields loaded from the index, with `_source` filtering, to
+    the ones requested with the `fields` query parameter, repeated or comma separated,
+    or by default to the fields of the view serializer, when it lists them. Nested
+    fields can be requested with dotted names. The requested fields are set in the
+    view `source_fields`, for the `SourceFieldsSerializerMixin`."""
+
+    fields_query_param = "fields"
+
+    def get_source_fields(self, request, view) -> List[str]:
+        names = [
+            name
+            for value in request.query_params.getlist(self.fields_query_param)
+            for name in value.split(",")
+            if name
+        ]
+
+        if not names:
+            names = list(view.get_serializer_class().Meta.fields)
+
+        return names
+
+    def filter_queryset(self, request, queryset, view):
+        names = self.get_source_fields(request, view)
+        if not names:
+            return queryset
+
+        view.source_fields = [name.split(".")[0] for name in names]
+
+        # the serializer fields that are not document fields, such as the
+        # highlights, are not in the source
+        includes = [
+            name for name in names if name.split(".")[0] in view.document._fields
+        ]
+
+        return queryset.source(includes or False)
+
+
+class CachedFacetsMixin:
+    """Pagination mixin that returns the facets cached by the
+    `CachedFacetedSearchFilterBackend`, or caches the facets of the response."""
+
+    view = None
+
+    def get_cached_facets(self, facets: Optional[Dict]) -> Optional[Dict]:
+        cached_facets = getattr(self.view, "cached_facets", None)
+        if cached_facets is not None:
+            return cached_facets
+
+        key = getattr(self.view, "facets_cache_key", None)
+        if key and facets is not None:
+            cache.set(key, facets, settings.ES_FACET_CACHE_TIMEOUT)
+
+        return facets
 
 
 # https://django-elasticsearch-dsl-drf.readthedocs.io/en/latest/advanced_usage_examples.html?highlight=size#customisations
-class PageNumberPagination(BasePageNumberPagination):
+class PageNumberPagination(CachedFacetsMixin, BasePageNumberPagination):
     """Custom page number pagination."""
 
     max_page_size = 1000
     page_size_query_param = "page_size"
 
+    def paginate_queryset(self, queryset, request, view=None):
+        self.view = view
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_facets(self, page=None):
+        return self.get_cached_facets(super().get_facets(page))
+
     def get_paginated_response_context(self, data):
         __data = super().get_paginated_response_context(data)
         __data.append(("current_page", int(self.request.query_params.get("page", 1))))
@@ -17,3 +186,102 @@ class PageNumberPagination(BasePageNumberPagination):
         __data.append(("ordering", self.request.query_params.get("ordering", "")))
 
         return sorted(__data)
+
+
+class SearchAfterPagination(CachedFacetsMixin, BasePagination):
+    """Cursor pagination, using `search_after` with the sort values of the last
+    result of the previous page, so that walking through all the results takes the
+    same time per page, however deep, and is not limited by the result window.
+
+    The search is sorted by the `id` after its own ordering, so that the order of
+    the results is total. The first page is requested with an empty `cursor` query
+    parameter, the following pages with the `next` link. The total count and the
+    facets are only returned with the first page."""
+
+    cursor_query_param = "cursor"
+    tiebreaker = "id"
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 1000
+    page_size_query_param = "page_size"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.view = view
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(
+            request.query_params.get(self.cursor_query_param)
+        )
+
+        sort = list(queryset._sort) or ["_score"]
+        if self.tiebreaker not in sort:
+            sort.append(self.tiebreaker)
+
+        queryset = queryset.sort(*sort).extra(size=self.page_size)
+        if self.cursor:
+            queryset = queryset.extra(search_after=self.cursor)
+        else:
+            queryset = queryset.extra(track_total_hits=True)
+
+        self.response = queryset.execute()
+        self.results = list(self.response)
+
+        return self.results
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        return min(max(page_size, 1), self.max_page_size)
+
+    def decode_cursor(self, cursor: Optional[str]) -> Optional[List]:
+        if not cursor:
+            return None
+
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, ValueError):
+            raise NotFound("Invalid cursor")
+
+        if not isinstance(values, list):
+            raise NotFound("Invalid cursor")
+
+        return values
+
+    def encode_cursor(self, values: List) -> str:
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def get_next_link(self) -> Optional[str]:
+        if len(self.results) < self.page_size:
+            return None
+
+        # the facets are only computed for the first page
+        url = remove_query_param(
+            self.request.build_absolute_uri(),
+            CachedFacetedSearchFilterBackend.facets_query_param,
+        )
+
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            self.encode_cursor(list(self.results[-1].meta.sort)),
+        )
+
+    def get_paginated_response(self, data):
+        __data = [
+            ("next", self.get_next_link()),
+            ("page_size", self.page_size),
+            ("results", data),
+        ]
+
+        if not self.cursor:
+            __data.append(("count", self.response.hits.total.value))
+
+            facets = self.get_cached_facets(
+                getattr(self.response.aggregations, "_d_", None)
+            )
+            if facets:
+                __data.append(("facets", facets))
+
+        return Response(OrderedDict(sorted(__data)))
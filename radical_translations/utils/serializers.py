@@ -0,0 +1,17 @@
+from collections import OrderedDict
+
+
+class SourceFieldsSerializerMixin:
+    """Document serializer mixin that only serializes the fields loaded by the
+    `SourceFieldsFilterBackend`, when the view sets them."""
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        names = getattr(self.context.get("view"), "source_fields", None)
+        if not names:
+            return fields
+
+        return OrderedDict(
+            (name, field) for name, field in fields.items() if name in names
+        )
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from geonames_place.models import Country
+
+from radical_translations.utils.documents import clear_countries
+
+
+@receiver(post_delete, sender=Country)
+@receiver(post_save, sender=Country)
+def country_changed(sender, instance: Country, **kwargs):
+    clear_countries()
@@ -0,0 +1,51 @@
+import pytest
+from django.core.cache import cache
+from geonames_place.models import Country
+
+from radical_translations.utils import documents
+
+pytestmark = pytest.mark.django_db
+
+
+def test_get_countries():
+    assert not documents.is_country_name("Utopia")
+
+    country = Country.objects.create(name="Utopia", code="UT")
+    assert documents.get_country_name(country.id) == "Utopia"
+    assert documents.is_country_name("Utopia")
+    assert not documents.is_country_name("Dystopia")
+
+    country.name = "Dystopia"
+    country.save()
+    assert documents.is_country_name("Dystopia")
+
+    country.delete()
+    assert country.id not in documents.get_countries()
+
+
+def test_get_countries_other_process(monkeypatch):
+    country = Country.objects.create(name="Utopia", code="UT")
+    assert documents.is_country_name("Utopia")
+
+    # changed without signals, the loaded countries are kept
+    Country.objects.filter(pk=country.pk).update(name="Dystopia")
+    assert documents.get_country_name(country.id) == "Utopia"
+
+    # another process cleared the countries, the version is checked once it expires
+    cache.set(documents.COUNTRIES_VERSION_KEY, "changed", None)
+    assert documents.get_country_name(country.id) == "Utopia"
+
+    monkeypatch.setattr(documents, "COUNTRIES_VERSION_TIMEOUT", 0)
+    assert documents.get_country_name(country.id) == "Dystopia"
+    assert not documents.is_country_name("Utopia")
+
+
+def test_get_content_hash():
+    data = {"id": 1, "title": ["a title"], "year": [1789, 1790]}
+    content_hash = documents.get_content_hash(data)
+
+    assert content_hash == documents.get_content_hash(dict(reversed(data.items())))
+    assert content_hash == documents.get_content_hash(
+        {**data, "content_hash": content_hash}
+    )
+    assert content_hash != documents.get_content_hash({**data, "year": [1789]})
@@ -0,0 +1,89 @@
+import pytest
+from django.db import transaction
+
+from radical_translations.core.documents import ResourceDocument
+from radical_translations.core.models import Resource, Title
+from radical_translations.core.tests.factories import ResourceFactory, TitleFactory
+from radical_translations.utils.indexing import TransactionSignalProcessor
+from radical_translations.utils.models import IndexQueueItem
+
+pytestmark = pytest.mark.django_db
+
+
+class TestTransactionSignalProcessor:
+    @pytest.fixture
+    def processor(self, settings) -> TransactionSignalProcessor:
+        settings.ELASTICSEARCH_DSL_AUTOSYNC = True
+        # the test transaction is never committed, so the queue is never flushed
+        settings.ELASTICSEARCH_DSL_ON_COMMIT = True
+
+        processor = TransactionSignalProcessor(None)
+        # the tests call the handlers directly
+        processor.teardown()
+
+        return processor
+
+    @pytest.mark.usefixtures("vocabulary")
+    def test_handle_save(self, processor: TransactionSignalProcessor):
+        resource = ResourceFactory()
+
+        for _ in range(3):
+            processor.handle_save(Resource, resource)
+
+        pending = processor.get_pending()
+        assert pending[(ResourceDocument, "index")] == {resource.id}
+
+    @pytest.mark.usefixtures("vocabulary")
+    def test_handle_delete(self, processor: TransactionSignalProcessor):
+        resource = ResourceFactory()
+        processor.handle_save(Resource, resource)
+
+        processor.handle_pre_delete(Resource, resource)
+        processor.handle_delete(Resource, resource)
+
+        pending = processor.get_pending()
+        assert pending[(ResourceDocument, "index")] == set()
+        assert pending[(ResourceDocument, "delete")] == {resource.id}
+
+    def test_handle_save_fan_out(self, settings, processor: TransactionSignalProcessor):
+        settings.ELASTICSEARCH_DSL_FAN_OUT_LIMIT = 2
+
+        title = TitleFactory()
+        resources = [Resource.objects.create(title=title) for _ in range(3)]
+
+        processor.handle_save(Resource, resources[0])
+        processor.handle_save(Title, title)
+        processor.handle_save(Title, title)
+
+        pending = processor.get_pending()
+        assert pending[(ResourceDocument, "index")] == {resources[0].id}
+
+        queued = IndexQueueItem.objects.values_list("object_id", flat=True)
+        assert sorted(queued) == [resources[1].id, resources[2].id]
+
+    def test_flush(self, processor: TransactionSignalProcessor):
+        processor.flush()
+        assert not processor.get_pending()
+
+    def test_rollback(
+        self,
+        monkeypatch,
+        django_capture_on_commit_callbacks,
+        processor: TransactionSignalProcessor,
+    ):
+        flushed = []
+        monkeypatch.setattr(
+            "radical_translations.utils.indexing.index_pending", flushed.append
+        )
+
+        with pytest.raises(ValueError):
+            with transaction.atomic():
+                processor.handle_delete(Resource, Resource(pk=1))
+                raise ValueError()
+
+        # the objects of the rolled back transaction are not indexed
+        with django_capture_on_commit_callbacks(execute=True):
+            processor.queue(Resource(pk=2), "index")
+
+        assert flushed == [{(ResourceDocument, "index"): {2}}]
+        assert not processor.get_pending()
@@ -1,7 +1,9 @@
 import pytest
+from django.utils import timezone
 
 from radical_translations.utils.models import (
     Date,
+    IndexWatermark,
     get_date_radical_from_gregorian,
     get_geonames_place_from_gsx_place,
     get_gsx_entry_value,
@@ -32,6 +34,29 @@ class TestDate:
         date.date_radical = "year 7"
         assert date.is_radical
 
+    def test_refresh_bounds(self):
+        date = Date.from_date_display("1790-12-12/1799-12-12")
+        assert date.date_lower.year == 1790
+        assert date.date_upper.year == 1799
+        assert date.year_earliest == 1790
+        assert date.year_latest == 1799
+
+        date.date_display = "1800"
+        date.save()
+        assert date.year_earliest == 1800
+        assert date.year_latest == 1800
+
+    def test_refresh_all_bounds(self):
+        date = Date.from_date_display("1790")
+        assert Date.refresh_all_bounds() == 0
+
+        Date.objects.filter(pk=date.pk).update(year_earliest=None, year_latest=None)
+        assert Date.refresh_all_bounds() == 1
+
+        date.refresh_from_db()
+        assert date.year_earliest == 1790
+        assert date.year_latest == 1790
+
     def test_get_date_earliest(self):
         date = Date()
         assert date.get_date_earliest() is None
@@ -101,3 +126,15 @@ def test_get_place_from_gsx_place():
     place = get_geonames_place_from_gsx_place(name)
     assert place is not None
     assert address in place.address
+
+
+class TestIndexWatermark:
+    def test_watermark(self):
+        assert IndexWatermark.get_watermark("rt-resources") is None
+
+        now = timezone.now()
+        IndexWatermark.set_watermark("rt-resources", now)
+        assert IndexWatermark.get_watermark("rt-resources") == now
+
+        IndexWatermark.set_watermark("rt-resources", now)
+        assert IndexWatermark.objects.count() == 1
@@ -0,0 +1,31 @@
+import pytest
+
+from radical_translations.utils.models import Date
+from radical_translations.utils.profiling import PrepareProfiler
+
+pytestmark = pytest.mark.django_db
+
+
+class TestPrepareProfiler:
+    def test_measure(self):
+        profiler = PrepareProfiler()
+        measured = profiler.measure(
+            "DateDocument", "count", lambda _: Date.objects.count()
+        )
+
+        with profiler.record():
+            for _ in range(3):
+                assert measured(None) == 0
+
+        report = profiler.get_report()
+        assert len(report) == 1
+        assert report[0]["field"] == "count"
+        assert report[0]["calls"] == 3
+        assert report[0]["queries"] == 3
+
+        stats = profiler.pop_stats()
+        assert not profiler.get_report()
+
+        profiler.merge(stats)
+        profiler.merge(stats)
+        assert profiler.get_report()[0]["calls"] == 6
@@ -0,0 +1,177 @@
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+from elasticsearch_dsl import Search
+from elasticsearch_dsl.response import Response
+from rest_framework.request import Request
+
+from radical_translations.core.serializers import ResourceDocumentSerializer
+from radical_translations.core.views import ResourceViewSet, SimpleResourceViewSet
+from radical_translations.users.models import User
+from radical_translations.utils.search import (
+    CachedFacetedSearchFilterBackend,
+    PageNumberPagination,
+    SearchAfterPagination,
+    SourceFieldsFilterBackend,
+    get_facets_cache_key,
+    invalidate_facets,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+def get_request(request_factory: RequestFactory, url: str, user=None) -> Request:
+    request = Request(request_factory.get(url))
+    request.user = user or AnonymousUser()
+
+    return request
+
+
+def test_get_facets_cache_key(user: User, request_factory: RequestFactory):
+    view = ResourceViewSet()
+
+    key = get_facets_cache_key(
+        get_request(request_factory, "/?subjects=a&subjects=b&page=2"), view
+    )
+
+    assert key == get_facets_cache_key(
+        get_request(request_factory, "/?subjects=b&subjects=a&ordering=year"), view
+    )
+    assert key != get_facets_cache_key(
+        get_request(request_factory, "/?subjects=a"), view
+    )
+    assert key != get_facets_cache_key(
+        get_request(request_factory, "/?subjects=a&subjects=b", user), view
+    )
+
+    invalidate_facets()
+    assert key != get_facets_cache_key(
+        get_request(request_factory, "/?subjects=a&subjects=b&page=2"), view
+    )
+
+
+def test_get_requested_facets(request_factory: RequestFactory):
+    view = ResourceViewSet()
+    backend = CachedFacetedSearchFilterBackend()
+
+    for url, expected in [
+        ("/", []),
+        ("/?facets=none", []),
+        ("/?facets=all", list(view.faceted_search_fields.keys())),
+        ("/?facets=subject,language,unknown", ["language", "subject"]),
+        ("/?facets=subject&facets=language", ["language", "subject"]),
+    ]:
+        request = get_request(request_factory, url)
+        assert backend.get_requested_facets(request, view) == expected
+
+    request = get_request(request_factory, "/?facets=none")
+    search = backend.filter_queryset(request, view.document.search(), view)
+    assert "aggs" not in search.to_dict()
+    assert not hasattr(view, "facets_cache_key")
+
+
+def test_cached_facets(request_factory: RequestFactory):
+    view = ResourceViewSet()
+    request = get_request(request_factory, "/?subjects=a&facets=all")
+
+    backend = CachedFacetedSearchFilterBackend()
+    search = backend.filter_queryset(request, view.document.search(), view)
+    assert "aggs" in search.to_dict()
+    assert view.facets_cache_key
+
+    facets = {"subjects": {"buckets": []}}
+    pagination = PageNumberPagination()
+    pagination.view = view
+    page = SimpleNamespace(facets=SimpleNamespace(_d_=facets))
+    assert pagination.get_facets(page) == facets
+
+    view = ResourceViewSet()
+    search = backend.filter_queryset(request, view.document.search(), view)
+    assert "aggs" not in search.to_dict()
+    assert view.cached_facets == facets
+
+    pagination.view = view
+    assert pagination.get_facets(SimpleNamespace()) == facets
+
+
+def test_search_after_pagination(request_factory: RequestFactory, monkeypatch):
+    searches = []
+
+    def execute(search):
+        searches.append(search.to_dict())
+        hits = [
+            {"_id": str(pk), "_source": {"id": pk}, "sort": ["title", pk]}
+            for pk in (1, 2)
+        ]
+        return Response(
+            search, {"hits": {"total": {"value": 3, "relation": "eq"}, "hits": hits}}
+        )
+
+    monkeypatch.setattr(Search, "execute", execute)
+
+    view = ResourceViewSet()
+    view.action = "list"
+    view.request = get_request(request_factory, "/?cursor=&page_size=2&facets=all")
+    assert isinstance(view.paginator, SearchAfterPagination)
+
+    queryset = view.document.search().sort("title.sort")
+    results = view.paginator.paginate_queryset(queryset, view.request, view)
+    assert [hit.id for hit in results] == [1, 2]
+    assert searches[-1]["sort"] == ["title.sort", "id"]
+    assert searches[-1]["size"] == 2
+    assert "search_after" not in searches[-1]
+
+    data = view.paginator.get_paginated_response([]).data
+    assert data["count"] == 3
+    params = parse_qs(urlparse(data["next"]).query)
+    assert "facets" not in params
+
+    view = ResourceViewSet()
+    view.action = "list"
+    view.request = get_request(
+        request_factory, f"/?cursor={params['cursor'][0]}&page_size=2"
+    )
+    view.paginator.paginate_queryset(queryset, view.request, view)
+    assert searches[-1]["search_after"] == ["title", 2]
+
+    data = view.paginator.get_paginated_response([]).data
+    assert "count" not in data
+
+    view = ResourceViewSet()
+    view.action = "list"
+    view.request = get_request(request_factory, "/?page_size=2")
+    assert isinstance(view.paginator, PageNumberPagination)
+
+
+def test_source_fields(request_factory: RequestFactory):
+    backend = SourceFieldsFilterBackend()
+
+    view = ResourceViewSet()
+    request = get_request(
+        request_factory, "/?fields=id,title&fields=highlight,places.place.geo"
+    )
+    search = backend.filter_queryset(request, view.document.search(), view)
+    assert search.to_dict()["_source"] == ["id", "title", "places.place.geo"]
+    assert view.source_fields == ["id", "title", "highlight", "places"]
+
+    serializer = ResourceDocumentSerializer(context={"view": view})
+    assert set(serializer.fields.keys()) == {"id", "title", "highlight", "places"}
+
+    view = ResourceViewSet()
+    search = backend.filter_queryset(
+        get_request(request_factory, "/"), view.document.search(), view
+    )
+    assert "_source" not in search.to_dict()
+
+    serializer = ResourceDocumentSerializer(context={"view": view})
+    assert len(serializer.fields) > 4
+
+    # defaults to the fields of the serializer
+    view = SimpleResourceViewSet()
+    search = backend.filter_queryset(
+        get_request(request_factory, "/"), view.document.search(), view
+    )
+    assert "form_genre" in search.to_dict()["_source"]